@@ -0,0 +1,205 @@
+from typing import AsyncIterator, Sequence
+
+from sqlalchemy import RowMapping
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import run_in_threadpool, iterate_in_threadpool
+
+from . import users
+from .users import (
+    user_batches_statement, user_row_batches_statement, user_fields_statement, users_slice_statement, users_after_statement,
+    count_users_statement, search_users_statement, search_count_statement, existing_emails_statement, create_users_statement,
+    update_user_statement, update_users_statement, delete_users_statement
+)
+from .engine import async_engine, async_read_engine, is_replica
+from .session import AnySession
+from .user_count import count_config, users_count_cache, users_count_changed
+from .user_cache import user_cache, invalidate_users_async
+from ..models.User import User, UserCreate, UserUpdate, UserFilters
+from ..utils.profiling import count_loaded_objects
+
+
+async def get_user(session: AnySession, user_id: int) -> User | None:
+    user = await user_cache.get_async(user_id)
+    if user is not None:
+        return user
+    generation = user_cache.generation
+    if user_cache.backend is not None and is_replica(session.bind):
+        # Cache fills come from the primary: a lagging replica could put back a row that a committed write just invalidated
+        user = await get_primary_user(user_id)
+    elif not isinstance(session, AsyncSession):
+        user = await run_in_threadpool(users.get_user, session, user_id)
+    else:
+        user = await session.get(User, user_id)
+    if user is not None:
+        count_loaded_objects([user])
+        await user_cache.set_async(user, generation)
+    return user
+
+async def get_primary_user(user_id: int) -> User | None:
+    if async_engine is None:
+        return await run_in_threadpool(users.get_primary_user, user_id)
+    async with AsyncSession(async_engine) as session:
+        return await session.get(User, user_id)
+
+async def iterate_user_batches(batch_size: int = 1000) -> AsyncIterator[Sequence[User]]:
+    if async_engine is None:
+        async for batch in iterate_in_threadpool(users.iterate_user_batches(batch_size)):
+            count_loaded_objects(batch)
+            yield batch
+        return
+    async with AsyncSession(async_read_engine()) as session:
+        result = await session.stream_scalars(user_batches_statement(batch_size))
+        async for batch in result.partitions():
+            count_loaded_objects(batch)
+            yield batch
+
+async def iterate_user_row_batches(fields: Sequence[str], batch_size: int = 1000) -> AsyncIterator[Sequence[RowMapping]]:
+    if async_engine is None:
+        async for batch in iterate_in_threadpool(users.iterate_user_row_batches(fields, batch_size)):
+            yield batch
+        return
+    async with AsyncSession(async_read_engine()) as session:
+        result = await session.stream(user_row_batches_statement(fields, batch_size))
+        async for batch in result.mappings().partitions():
+            yield batch
+
+async def get_user_fields(session: AnySession, user_id: int, fields: Sequence[str]) -> dict | None:
+    if not isinstance(session, AsyncSession):
+        return await run_in_threadpool(users.get_user_fields, session, user_id, fields)
+    row = (await session.exec(user_fields_statement(user_id, fields))).mappings().first()
+    return dict(row) if row is not None else None
+
+async def get_users_slice_fields(
+        session: AnySession,
+        limit: int,
+        offset: int,
+        fields: Sequence[str],
+        filters: UserFilters = UserFilters()
+) -> list[dict]:
+    if not isinstance(session, AsyncSession):
+        return await run_in_threadpool(users.get_users_slice_fields, session, limit, offset, fields, filters)
+    statement = users_slice_statement(limit, offset, filters, fields)
+    return [dict(row) for row in (await session.exec(statement)).mappings()]
+
+async def get_users_slice(session: AnySession, limit: int, offset: int, filters: UserFilters = UserFilters()) -> Sequence[User]:
+    if not isinstance(session, AsyncSession):
+        users_slice = await run_in_threadpool(users.get_users_slice, session, limit, offset, filters)
+    else:
+        users_slice = (await session.exec(users_slice_statement(limit, offset, filters))).all()
+    count_loaded_objects(users_slice)
+    return users_slice
+
+async def get_users_after(session: AnySession, last_id: int | None, limit: int) -> Sequence[User]:
+    if not isinstance(session, AsyncSession):
+        users_page = await run_in_threadpool(users.get_users_after, session, last_id, limit)
+    else:
+        users_page = (await session.exec(users_after_statement(last_id, limit))).all()
+    count_loaded_objects(users_page)
+    return users_page
+
+async def search_users(session: AnySession, q: str, limit: int, offset: int) -> Sequence[User]:
+    if not isinstance(session, AsyncSession):
+        found = await run_in_threadpool(users.search_users, session, q, limit, offset)
+    else:
+        statement = search_users_statement(q, limit, offset, session.bind.dialect.name)
+        found = (await session.exec(statement)).all()
+    count_loaded_objects(found)
+    return found
+
+async def count_search_results(session: AnySession, q: str) -> int:
+    if not isinstance(session, AsyncSession):
+        return await run_in_threadpool(users.count_search_results, session, q)
+    return (await session.exec(search_count_statement(q))).one()
+
+async def count_users(session: AnySession, filters: UserFilters = UserFilters()) -> int:
+    if filters.has_filters():
+        return await count_users_exact(session, filters)
+    if count_config.strategy == "cached":
+        total = users_count_cache.get()
+        if total is None:
+            generation = users_count_cache.generation
+            total = await count_users_exact(session)
+            users_count_cache.set(total, generation)
+        return total
+    if count_config.strategy == "estimated":
+        total = await estimate_users_count(session)
+        if total is not None:
+            return total
+    return await count_users_exact(session)
+
+async def count_users_exact(session: AnySession, filters: UserFilters = UserFilters()) -> int:
+    if not isinstance(session, AsyncSession):
+        return await run_in_threadpool(users.count_users, session, filters)
+    return (await session.exec(count_users_statement(filters))).one()
+
+async def estimate_users_count(session: AnySession) -> int | None:
+    if not isinstance(session, AsyncSession):
+        return await run_in_threadpool(users.estimate_users_count, session)
+    if session.bind.dialect.name != "postgresql":
+        return None
+    estimate = await session.scalar(users.ESTIMATED_COUNT_STATEMENT, {"table_name": f'"{User.__tablename__}"'})
+    return estimate if estimate and estimate > 0 else None
+
+async def get_existing_emails(session: AnySession, emails: Sequence[str]) -> set[str]:
+    if not isinstance(session, AsyncSession):
+        return await run_in_threadpool(users.get_existing_emails, session, emails)
+    return set((await session.exec(existing_emails_statement(emails))).all())
+
+async def create_user(session: AnySession, user: UserCreate) -> User:
+    if not isinstance(session, AsyncSession):
+        return await run_in_threadpool(users.create_user, session, user)
+    new_user = User(**user.model_dump(mode="json"))
+    session.add(new_user)
+    await session.flush()
+    users_count_changed(session)
+    return new_user
+
+async def create_users(session: AnySession, new_users: Sequence[UserCreate], batch_size: int = 1000) -> list[User]:
+    if not isinstance(session, AsyncSession):
+        return await run_in_threadpool(users.create_users, session, new_users, batch_size)
+    created = []
+    for start in range(0, len(new_users), batch_size):
+        batch = [user.model_dump(mode="json") for user in new_users[start:start + batch_size]]
+        user_ids = (await session.scalars(create_users_statement(), batch)).all()
+        created.extend(User(id=user_id, **user_data) for user_id, user_data in zip(user_ids, batch))
+    if created:
+        users_count_changed(session)
+    return created
+
+async def update_user(session: AnySession, user_id: int, user: UserUpdate) -> User | None:
+    if not isinstance(session, AsyncSession):
+        db_user = await run_in_threadpool(users.update_user, session, user_id, user)
+    else:
+        db_user = (await session.scalars(update_user_statement(user_id, user))).one_or_none()
+        await invalidate_users_async(session, [user_id])
+    if db_user is not None:
+        count_loaded_objects([db_user])
+    return db_user
+
+async def update_users(session: AnySession, user_ids: Sequence[int], user: UserUpdate) -> Sequence[int]:
+    if not isinstance(session, AsyncSession):
+        return await run_in_threadpool(users.update_users, session, user_ids, user)
+    updated_ids = (await session.scalars(update_users_statement(user_ids, user))).all()
+    await invalidate_users_async(session, updated_ids)
+    return updated_ids
+
+async def delete_users(session: AnySession, user_ids: Sequence[int]) -> Sequence[int]:
+    if not isinstance(session, AsyncSession):
+        return await run_in_threadpool(users.delete_users, session, user_ids)
+    deleted_ids = (await session.scalars(delete_users_statement(user_ids))).all()
+    await invalidate_users_async(session, deleted_ids)
+    if deleted_ids:
+        users_count_changed(session)
+    return deleted_ids
+
+async def delete_user(session: AnySession, user_id: int) -> bool:
+    if not isinstance(session, AsyncSession):
+        return await run_in_threadpool(users.delete_user, session, user_id)
+    user = await session.get(User, user_id)
+    if not user:
+        return False
+    await session.delete(user)
+    await session.flush()
+    await invalidate_users_async(session, [user_id])
+    users_count_changed(session)
+    return True
\ No newline at end of file
@@ -0,0 +1,22 @@
+from sqlalchemy import Index
+from sqlalchemy.exc import IntegrityError
+
+from app.models.User import User
+
+# SQLSTATE for unique_violation
+UNIQUE_VIOLATION = "23505"
+
+EMAIL_INDEX = next(index for index in User.__table__.indexes if index.name == "ix_user_email")
+
+
+def is_unique_violation(error: IntegrityError, index: Index) -> bool:
+    """Whether error is a duplicate key in index rather than any other constraint, as each supported driver reports it."""
+    orig = error.orig
+    if getattr(orig, "pgcode", None) == UNIQUE_VIOLATION:
+        # psycopg2 carries the constraint in diag, asyncpg on the exception the adapter was raised from
+        diag = getattr(orig, "diag", None)
+        constraint = diag.constraint_name if diag is not None else getattr(orig.__cause__, "constraint_name", None)
+        return constraint == index.name
+    # SQLite names the columns instead: "UNIQUE constraint failed: user.email"
+    columns = ", ".join(f"{index.table.name}.{column.name}" for column in index.columns)
+    return str(orig) == f"UNIQUE constraint failed: {columns}"
\ No newline at end of file
@@ -1,12 +1,114 @@
-import os
+import asyncio
+from typing import Any, Callable
 
+from sqlalchemy import Engine, make_url
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
 from sqlalchemy.orm import Session
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
 from sqlmodel import create_engine, SQLModel, text
+from starlette.concurrency import run_in_threadpool
 
-engine = create_engine(os.getenv("DATABASE_ENGINE"), pool_size=int(os.getenv("DATABASE_POOL_SIZE", 10)))
+from app.models.PoolStatus import PoolStats, PoolStatus
+from app.settings import DatabaseSettings
+from app.utils.metrics import render_family, render_histogram_family
+from .instrumentation import instrument_engine
+from .migrations import upgrade_user_table
+from .pool import PoolMonitor, monitored_pool_class, pool_stats
+from .replicas import ReplicaSet
+
+database_config = DatabaseSettings()
+
+def connect_args(url: str) -> dict[str, Any]:
+    driver = make_url(url).drivername
+    if driver == "postgresql+asyncpg":
+        if database_config.pgbouncer:
+            return {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+        if database_config.statement_timeout_ms is not None:
+            return {"server_settings": {"statement_timeout": str(database_config.statement_timeout_ms)}}
+    elif driver.startswith("postgresql"):
+        if database_config.statement_timeout_ms is not None and not database_config.pgbouncer:
+            return {"options": f"-c statement_timeout={database_config.statement_timeout_ms}"}
+    return {}
+
+def is_in_memory_sqlite(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")
+
+def engine_options(url: str, pool_class: type[QueuePool], monitor: PoolMonitor) -> dict[str, Any]:
+    if is_in_memory_sqlite(url):
+        # Each new connection would open its own empty database, so the pool keeps exactly one and never recycles it.
+        # Sessions take turns on it: sharing it concurrently would mix their transactions.
+        return {
+            "poolclass": monitored_pool_class(pool_class, monitor),
+            "pool_size": 1,
+            "max_overflow": 0,
+            "pool_timeout": database_config.pool_timeout,
+            "pool_recycle": -1,
+            "connect_args": {"check_same_thread": False},
+        }
+    return {
+        "poolclass": monitored_pool_class(pool_class, monitor),
+        "pool_size": database_config.pool_size,
+        "max_overflow": database_config.max_overflow,
+        "pool_timeout": database_config.pool_timeout,
+        "pool_recycle": database_config.pool_recycle,
+        "pool_pre_ping": database_config.pool_pre_ping,
+        "pool_use_lifo": database_config.pool_use_lifo,
+        "connect_args": connect_args(url),
+    }
+
+engine_monitor = PoolMonitor()
+engine = create_engine(database_config.engine, **engine_options(database_config.engine, QueuePool, engine_monitor))
+instrument_engine(engine, "engine")
+
+async_engine_monitor = PoolMonitor()
+async_engine: AsyncEngine | None = None
+if database_config.async_engine:
+    async_engine = create_async_engine(
+        database_config.async_engine,
+        **engine_options(database_config.async_engine, AsyncAdaptedQueuePool, async_engine_monitor),
+    )
+    instrument_engine(async_engine.sync_engine, "async_engine")
+
+replica_monitors: dict[str, PoolMonitor] = {}
+
+def create_replica_set(urls: list[str], prefix: str, create: Callable[..., Any], pool_class: type[QueuePool]) -> ReplicaSet:
+    names, replicas = [], []
+    for index, url in enumerate(urls):
+        name = f"{prefix}-{index}"
+        monitor = replica_monitors[name] = PoolMonitor()
+        replica = create(url, **engine_options(url, pool_class, monitor))
+        instrument_engine(replica.sync_engine if isinstance(replica, AsyncEngine) else replica, name)
+        names.append(name)
+        replicas.append(replica)
+    return ReplicaSet(names, replicas)
+
+replica_set: ReplicaSet[Engine] = create_replica_set(database_config.replica_list(), "replica", create_engine, QueuePool)
+async_replica_set: ReplicaSet[AsyncEngine] = create_replica_set(
+    database_config.async_replica_list() if async_engine is not None else [], "async_replica", create_async_engine, AsyncAdaptedQueuePool
+)
+
+def read_engine() -> Engine:
+    # Reads that tolerate replication lag; with no healthy replica they go to the primary
+    replica = replica_set.choose()
+    return replica if replica is not None else engine
+
+def async_read_engine() -> AsyncEngine | None:
+    replica = async_replica_set.choose()
+    return replica if replica is not None else async_engine
+
+def is_replica(bind: Engine | AsyncEngine | None) -> bool:
+    return any(bind is replica for replica in (*replica_set.engines, *async_replica_set.engines))
+
+async def refresh_replica_health(timeout_seconds: float) -> None:
+    await asyncio.gather(replica_set.refresh(timeout_seconds), async_replica_set.refresh(timeout_seconds))
 
 def create_db_and_tables() -> None:
-    SQLModel.metadata.create_all(engine)
+    with engine.begin() as connection:
+        if connection.dialect.name == "postgresql":
+            connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        SQLModel.metadata.create_all(connection)
+        upgrade_user_table(connection)
 
 def check_db_availability() -> bool:
     try:
@@ -15,4 +117,61 @@ def check_db_availability() -> bool:
         return True
     except Exception as error:
         print(error)
-        return False
\ No newline at end of file
+        return False
+
+async def check_db_availability_async() -> bool:
+    if async_engine is None:
+        return await run_in_threadpool(check_db_availability)
+    try:
+        async with AsyncSession(async_engine) as session:
+            await session.execute(text("SELECT 1"))
+        return True
+    except Exception as error:
+        print(error)
+        return False
+
+def get_pool_status() -> PoolStatus:
+    return PoolStatus(
+        engine=pool_stats(engine, engine_monitor),
+        async_engine=pool_stats(async_engine.sync_engine, async_engine_monitor) if async_engine is not None else None,
+        replicas=replica_pool_stats(),
+    )
+
+def replica_pool_stats() -> dict[str, PoolStats]:
+    stats = {}
+    for replicas in (replica_set, async_replica_set):
+        for name, replica in zip(replicas.names, replicas.engines):
+            stats[name] = pool_stats(replica.sync_engine if isinstance(replica, AsyncEngine) else replica, replica_monitors[name])
+    return stats
+
+def get_pool_saturation() -> float:
+    # Share of the request-serving pool's capacity (pool_size + max_overflow) that is checked out
+    pool = (async_engine.sync_engine if async_engine is not None else engine).pool
+    capacity = pool.size() + max(pool._max_overflow, 0)
+    return round(pool.checkedout() / capacity, 4) if capacity > 0 else 0.0
+
+def pool_metrics() -> list[str]:
+    pool_status = get_pool_status()
+    pools = [({"engine": name}, stats) for name, stats in (("engine", pool_status.engine), ("async_engine", pool_status.async_engine)) if stats is not None]
+    pools += [({"engine": name}, stats) for name, stats in pool_status.replicas.items()]
+    replicas = [
+        ({"engine": name}, int(healthy))
+        for replicas in (replica_set, async_replica_set) for name, healthy in zip(replicas.names, replicas.healthy)
+    ]
+    return [
+        *render_family("db_pool_size", "gauge", "Connections the pool keeps open", ((labels, stats.size) for labels, stats in pools)),
+        *render_family("db_pool_checked_out", "gauge", "Connections currently checked out", ((labels, stats.checked_out) for labels, stats in pools)),
+        *render_family("db_pool_overflow", "gauge", "Connections opened beyond pool_size", ((labels, stats.overflow) for labels, stats in pools)),
+        *render_family("db_pool_timeouts_total", "counter", "Checkouts that timed out waiting for a connection", ((labels, stats.timeouts) for labels, stats in pools)),
+        *render_histogram_family("db_pool_wait_seconds", "Time spent waiting for a pooled connection", ((labels, stats.wait_seconds.model_dump()) for labels, stats in pools)),
+        *render_family("db_replica_healthy", "gauge", "Whether the read replica passed its last health check", replicas),
+    ]
+
+async def dispose_engines() -> None:
+    for async_replica in async_replica_set.engines:
+        await async_replica.dispose()
+    if async_engine is not None:
+        await async_engine.dispose()
+    for replica in replica_set.engines:
+        replica.dispose()
+    engine.dispose()
\ No newline at end of file
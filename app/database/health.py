@@ -0,0 +1,68 @@
+import asyncio
+import time
+from contextlib import suppress
+from datetime import datetime, timezone
+
+from app.settings import HealthSettings
+from .engine import check_db_availability_async, refresh_replica_health
+
+health_config = HealthSettings()
+
+
+class DatabaseProbe:
+    def __init__(self, interval_seconds: float, timeout_seconds: float, max_staleness_intervals: int):
+        self.interval_seconds = interval_seconds
+        self.timeout_seconds = timeout_seconds
+        self.max_staleness_intervals = max_staleness_intervals
+        self.available = False
+        self.checked_at: datetime | None = None
+        self.latency_ms: float | None = None
+        self._checked_monotonic: float | None = None
+        # A check that outlives the timeout keeps running and is awaited again next round,
+        # so a hung database never accumulates concurrent probes
+        self._check: asyncio.Future | None = None
+        self._check_started = 0.0
+        self._loop: asyncio.Task | None = None
+
+    async def refresh(self) -> bool:
+        if self._check is None or self._check.done():
+            self._check = asyncio.ensure_future(check_db_availability_async())
+            self._check_started = time.perf_counter()
+        # Replicas are checked alongside the primary, so one probe round still takes at most timeout_seconds
+        (done, _), _ = await asyncio.gather(
+            asyncio.wait({self._check}, timeout=self.timeout_seconds), refresh_replica_health(self.timeout_seconds)
+        )
+        self.available = bool(done) and self._check.result()
+        self.latency_ms = round((time.perf_counter() - self._check_started) * 1000, 3) if done else None
+        self.checked_at = datetime.now(timezone.utc)
+        self._checked_monotonic = time.monotonic()
+        return self.available
+
+    def is_ready(self) -> bool:
+        if self._checked_monotonic is None:
+            return False
+        age = time.monotonic() - self._checked_monotonic
+        return self.available and age <= self.interval_seconds * self.max_staleness_intervals
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            await self.refresh()
+
+    async def start(self) -> None:
+        await self.refresh()
+        self._loop = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        for task in (self._loop, self._check):
+            if task is not None and not task.done():
+                task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await task
+        self._loop = None
+
+database_probe = DatabaseProbe(
+    interval_seconds=health_config.probe_interval_seconds,
+    timeout_seconds=health_config.probe_timeout_seconds,
+    max_staleness_intervals=health_config.max_staleness_intervals,
+)
\ No newline at end of file
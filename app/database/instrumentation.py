@@ -0,0 +1,36 @@
+import time
+
+from sqlalchemy import Engine, event
+
+from app.utils.metrics import CounterFamily, HistogramFamily
+from app.utils.profiling import current_profile
+
+db_statement_duration_seconds = HistogramFamily(
+    "db_statement_duration_seconds", "SQL statement execution time by engine and operation", ("engine", "operation")
+)
+db_statement_errors_total = CounterFamily("db_statement_errors_total", "SQL statements that raised an error", ("engine",))
+
+def statement_operation(statement: str) -> str:
+    words = statement.split(None, 1)
+    return words[0].upper() if words else "UNKNOWN"
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_statement_timer(connection, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context.statement_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def stop_statement_timer(connection, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "statement_started", None)
+        if started is not None:
+            seconds = time.perf_counter() - started
+            db_statement_duration_seconds.labels(name, statement_operation(statement)).observe(seconds)
+            # Set only while profiling is on, so the profiler needs no listeners of its own
+            profile = current_profile.get()
+            if profile is not None:
+                profile.add_statement(statement, seconds)
+
+    @event.listens_for(engine, "handle_error")
+    def count_statement_error(exception_context):
+        db_statement_errors_total.inc(name)
\ No newline at end of file
@@ -0,0 +1,31 @@
+from sqlalchemy import Connection, inspect, text
+from sqlalchemy.exc import DatabaseError, IntegrityError
+
+from app.database.constraints import is_unique_violation
+from app.models.User import User
+
+
+def upgrade_user_table(connection: Connection) -> None:
+    """Brings a user table created by an earlier release up to the current model.
+
+    create_all() skips tables that already exist, so whatever was added to User since has to be added here.
+    Every step checks first, so this runs on each startup.
+    """
+    table = connection.dialect.identifier_preparer.quote(User.__tablename__)
+    columns = {column["name"] for column in inspect(connection).get_columns(User.__tablename__)}
+    if "version" not in columns:
+        connection.execute(text(f"ALTER TABLE {table} ADD COLUMN version INTEGER NOT NULL DEFAULT 1"))
+
+    # Indexes, the unique email one included, come with the table only. checkfirst skips existing ones,
+    # and PostgreSQL-only indexes (pattern ops, pg_trgm) keep their dialect condition.
+    for index in User.__table__.indexes:
+        try:
+            with connection.begin_nested():
+                index.create(connection, checkfirst=True)
+        except DatabaseError as error:
+            if isinstance(error, IntegrityError) and is_unique_violation(error, index):
+                columns = ", ".join(column.name for column in index.columns)
+                raise RuntimeError(f"Cannot create unique index {index.name}: the user table has duplicate {columns} values") from error
+            # Another instance starting at the same time created it between the check and CREATE INDEX
+            if index.name not in {existing["name"] for existing in inspect(connection).get_indexes(User.__tablename__)}:
+                raise
\ No newline at end of file
@@ -0,0 +1,47 @@
+import threading
+import time
+
+from sqlalchemy import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import Pool, QueuePool
+
+from app.models.PoolStatus import PoolStats, HistogramSnapshot
+from app.utils.histogram import Histogram
+
+
+class PoolMonitor:
+    def __init__(self):
+        self.wait_seconds = Histogram()
+        self.timeouts = 0
+        self._lock = threading.Lock()
+
+    def timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+
+def monitored_pool_class(pool_class: type[Pool], monitor: PoolMonitor) -> type[Pool]:
+    class MonitoredPool(pool_class):
+        def _do_get(self):
+            started = time.perf_counter()
+            try:
+                return super()._do_get()
+            except PoolTimeoutError:
+                monitor.timeout()
+                raise
+            finally:
+                monitor.wait_seconds.observe(time.perf_counter() - started)
+
+    MonitoredPool.__name__ = f"Monitored{pool_class.__name__}"
+    return MonitoredPool
+
+def pool_stats(engine: Engine, monitor: PoolMonitor) -> PoolStats:
+    pool: QueuePool = engine.pool
+    return PoolStats(
+        size=pool.size(),
+        checked_in=pool.checkedin(),
+        checked_out=pool.checkedout(),
+        overflow=max(pool.overflow(), 0),
+        timeouts=monitor.timeouts,
+        wait_seconds=HistogramSnapshot(**monitor.wait_seconds.snapshot()),
+    )
\ No newline at end of file
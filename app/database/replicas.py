@@ -0,0 +1,74 @@
+import asyncio
+import itertools
+import threading
+from typing import Generic, Sequence, TypeVar
+
+from sqlalchemy import Engine, event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.concurrency import run_in_threadpool
+
+AnyEngine = TypeVar("AnyEngine", Engine, AsyncEngine)
+
+
+def check_replica(engine: Engine) -> bool:
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    return True
+
+async def check_replica_async(engine: Engine | AsyncEngine) -> bool:
+    if not isinstance(engine, AsyncEngine):
+        return await run_in_threadpool(check_replica, engine)
+    async with engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+    return True
+
+
+class ReplicaSet(Generic[AnyEngine]):
+    """Read replicas handed out round-robin, skipping those whose last health check failed.
+
+    The database probe refreshes health on its interval; a replica that fails to connect or drops its connection
+    in between is taken out at once and comes back after its next successful check.
+    """
+
+    def __init__(self, names: Sequence[str], engines: Sequence[AnyEngine]):
+        self.names = list(names)
+        self.engines = list(engines)
+        self.healthy = [True] * len(self.engines)
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        # A check that outlives the timeout keeps running and is awaited again next round, as in DatabaseProbe
+        self._checks: list[asyncio.Future | None] = [None] * len(self.engines)
+        for index, replica in enumerate(self.engines):
+            sync_engine = replica.sync_engine if isinstance(replica, AsyncEngine) else replica
+            event.listen(sync_engine, "handle_error", self._failure_listener(index))
+
+    def _failure_listener(self, index: int):
+        def mark_unhealthy(exception_context) -> None:
+            # No connection means connecting itself failed
+            if exception_context.is_disconnect or exception_context.connection is None:
+                self.healthy[index] = False
+        return mark_unhealthy
+
+    def __bool__(self) -> bool:
+        return bool(self.engines)
+
+    def choose(self) -> AnyEngine | None:
+        healthy = [replica for replica, is_healthy in zip(self.engines, self.healthy) if is_healthy]
+        if not healthy:
+            return None
+        with self._lock:
+            position = next(self._counter)
+        return healthy[position % len(healthy)]
+
+    async def refresh(self, timeout_seconds: float) -> list[bool]:
+        for index, replica in enumerate(self.engines):
+            if self._checks[index] is None or self._checks[index].done():
+                self._checks[index] = asyncio.ensure_future(check_replica_async(replica))
+        pending = [check for check in self._checks if check is not None]
+        if pending:
+            await asyncio.wait(pending, timeout=timeout_seconds)
+        self.healthy = [
+            check is not None and check.done() and not check.cancelled() and check.exception() is None
+            for check in self._checks
+        ]
+        return self.healthy
\ No newline at end of file
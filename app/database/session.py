@@ -0,0 +1,37 @@
+from typing import AsyncIterator
+
+from fastapi import Request
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from .engine import engine, async_engine, read_engine, async_read_engine
+
+AnySession = Session | AsyncSession
+
+READ_ONLY_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+async def get_session(request: Request) -> AsyncIterator[AnySession]:
+    # Read-only requests may go to a replica; anything that writes keeps its reads on the primary,
+    # so a request never reads behind its own changes
+    read_only = request.method in READ_ONLY_METHODS
+    if async_engine is not None:
+        async with AsyncSession(async_read_engine() if read_only else async_engine, expire_on_commit=False) as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+        return
+
+    session = Session(read_engine() if read_only else engine, expire_on_commit=False)
+    try:
+        yield session
+        await run_in_threadpool(session.commit)
+    except Exception:
+        await run_in_threadpool(session.rollback)
+        raise
+    finally:
+        await run_in_threadpool(session.close)
\ No newline at end of file
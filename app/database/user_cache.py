@@ -0,0 +1,122 @@
+import json
+import threading
+from typing import Iterable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlalchemy.util.concurrency import await_only, in_greenlet
+from starlette.concurrency import run_in_threadpool
+
+from app.models.CacheStatus import CacheStatus
+from app.models.User import User
+from app.settings import UserCacheSettings
+from app.utils.cache import CacheBackend, MemoryCache, RedisCache
+
+INVALIDATED_USER_IDS = "invalidated_user_ids"
+
+cache_config = UserCacheSettings()
+
+
+class UserCache:
+    def __init__(self, backend: CacheBackend | None, name: str):
+        self.backend = backend
+        self.name = name
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(user_id: int) -> str:
+        return f"user:{user_id}"
+
+    def get(self, user_id: int) -> User | None:
+        if self.backend is None:
+            return None
+        value = self.backend.get(self.key(user_id))
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return User.model_validate_json(value) if value is not None else None
+
+    def set(self, user: User, generation: int) -> None:
+        # A user read before an invalidation must not be cached after it: pass the generation taken before the read.
+        if self.backend is None:
+            return
+        # version is excluded from API dumps but is needed to rebuild the user's ETag
+        value = json.dumps({**user.model_dump(mode="json"), "version": user.version}).encode()
+        with self._lock:
+            if generation == self.generation:
+                self.backend.set(self.key(user.id), value)
+
+    def invalidate(self, user_ids: Iterable[int]) -> None:
+        if self.backend is None:
+            return
+        with self._lock:
+            self.generation += 1
+            self.backend.delete(self.key(user_id) for user_id in user_ids)
+
+    @property
+    def blocking(self) -> bool:
+        return self.backend is not None and self.backend.blocking
+
+    # The *_async variants are for the event loop: a blocking backend (Redis) is called from a worker thread
+    async def get_async(self, user_id: int) -> User | None:
+        if self.blocking:
+            return await run_in_threadpool(self.get, user_id)
+        return self.get(user_id)
+
+    async def set_async(self, user: User, generation: int) -> None:
+        if self.blocking:
+            await run_in_threadpool(self.set, user, generation)
+        else:
+            self.set(user, generation)
+
+    async def invalidate_async(self, user_ids: Iterable[int]) -> None:
+        if self.blocking:
+            await run_in_threadpool(self.invalidate, user_ids)
+        else:
+            self.invalidate(user_ids)
+
+    def status(self) -> CacheStatus:
+        size = len(self.backend) if isinstance(self.backend, MemoryCache) else None
+        return CacheStatus(backend=self.name, hits=self.hits, misses=self.misses, size=size)
+
+
+def create_backend(config: UserCacheSettings) -> CacheBackend | None:
+    if config.backend == "memory":
+        return MemoryCache(max_entries=config.max_entries, ttl_seconds=config.ttl_seconds)
+    if config.backend == "redis":
+        return RedisCache.from_url(config.redis_url, ttl_seconds=config.ttl_seconds)
+    return None
+
+user_cache = UserCache(create_backend(cache_config), name=cache_config.backend)
+
+def invalidate_users(session, user_ids: Iterable[int]) -> None:
+    # Drop entries now for reads later in this request, and again after commit. Each drop bumps the generation,
+    # so a concurrent read of the pre-commit row that finishes after the commit is not cached.
+    user_ids = set(user_ids)
+    user_cache.invalidate(user_ids)
+    session.info.setdefault(INVALIDATED_USER_IDS, set()).update(user_ids)
+
+async def invalidate_users_async(session, user_ids: Iterable[int]) -> None:
+    user_ids = set(user_ids)
+    await user_cache.invalidate_async(user_ids)
+    session.info.setdefault(INVALIDATED_USER_IDS, set()).update(user_ids)
+
+@event.listens_for(Session, "after_commit")
+def invalidate_committed_users(session: Session) -> None:
+    user_ids = session.info.pop(INVALIDATED_USER_IDS, None)
+    if not user_ids:
+        return
+    if in_greenlet() and user_cache.blocking:
+        # AsyncSession commits in a greenlet on the event loop; wait for the backend without blocking the loop
+        await_only(user_cache.invalidate_async(user_ids))
+    else:
+        user_cache.invalidate(user_ids)
+
+@event.listens_for(Session, "after_rollback")
+def forget_rolled_back_users(session: Session) -> None:
+    session.info.pop(INVALIDATED_USER_IDS, None)
\ No newline at end of file
@@ -0,0 +1,57 @@
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.settings import UsersCountSettings
+
+USERS_COUNT_CHANGED = "users_count_changed"
+
+count_config = UsersCountSettings()
+
+
+class CountCache:
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self.generation = 0
+        self._value: int | None = None
+        self._expires_at = 0.0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self) -> int | None:
+        with self._lock:
+            if self._value is None or self._expires_at < time.monotonic():
+                self.misses += 1
+                return None
+            self.hits += 1
+            return self._value
+
+    def set(self, value: int, generation: int) -> None:
+        # A count read before an invalidation must not overwrite the invalidation.
+        with self._lock:
+            if generation == self.generation:
+                self._value = value
+                self._expires_at = time.monotonic() + self.ttl_seconds
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._value = None
+
+users_count_cache = CountCache(count_config.ttl_seconds)
+
+def users_count_changed(session) -> None:
+    users_count_cache.invalidate()
+    session.info[USERS_COUNT_CHANGED] = True
+
+@event.listens_for(Session, "after_commit")
+def invalidate_committed_count(session: Session) -> None:
+    if session.info.pop(USERS_COUNT_CHANGED, False):
+        users_count_cache.invalidate()
+
+@event.listens_for(Session, "after_rollback")
+def forget_rolled_back_count(session: Session) -> None:
+    session.info.pop(USERS_COUNT_CHANGED, None)
\ No newline at end of file
@@ -1,44 +1,196 @@
-from typing import Iterable, Type, Sequence
+from typing import Iterator, Sequence
 
-from fastapi import HTTPException
-from sqlmodel import Session, select
-from .engine import engine
-from ..models.User import User, UserCreate, UserUpdate
+from sqlalchemy import RowMapping, select as select_columns
+from sqlmodel import Session, select, func, insert, update, delete, col, text, or_, case
+from .engine import engine, read_engine
+from .user_count import users_count_changed
+from .user_cache import invalidate_users
+from ..models.User import User, UserCreate, UserUpdate, UserFilters
 
 
-def get_user(user_id: int) -> User | None:
+def get_user(session: Session, user_id: int) -> User | None:
+    return session.get(User, user_id)
+
+def get_primary_user(user_id: int) -> User | None:
     with Session(engine) as session:
         return session.get(User, user_id)
 
-def get_users() -> Sequence[User]:
-    with Session(engine) as session:
-        statement = select(User)
-        return session.exec(statement).all()
+def user_columns(fields: Sequence[str]) -> list:
+    return [getattr(User, field) for field in fields]
+
+def user_batches_statement(batch_size: int):
+    return select(User).order_by(User.id).execution_options(yield_per=batch_size)
+
+def user_row_batches_statement(fields: Sequence[str], batch_size: int):
+    return select_columns(*user_columns(fields)).order_by(User.id).execution_options(yield_per=batch_size)
+
+def iterate_user_batches(batch_size: int = 1000) -> Iterator[Sequence[User]]:
+    # Streams outlive the request, so they own their session instead of using the request-scoped one.
+    with Session(read_engine()) as session:
+        yield from session.exec(user_batches_statement(batch_size)).partitions()
+
+def iterate_user_row_batches(fields: Sequence[str], batch_size: int = 1000) -> Iterator[Sequence[RowMapping]]:
+    with Session(read_engine()) as session:
+        yield from session.exec(user_row_batches_statement(fields, batch_size)).mappings().partitions()
+
+def user_fields_statement(user_id: int, fields: Sequence[str]):
+    return select_columns(*user_columns(fields)).where(User.id == user_id)
+
+def get_user_fields(session: Session, user_id: int, fields: Sequence[str]) -> dict | None:
+    row = session.exec(user_fields_statement(user_id, fields)).mappings().first()
+    return dict(row) if row is not None else None
+
+def filter_users(statement, filters: UserFilters):
+    if filters.email is not None:
+        statement = statement.where(User.email == filters.email)
+    if filters.email_prefix is not None:
+        statement = statement.where(col(User.email).startswith(filters.email_prefix, autoescape=True))
+    if filters.first_name is not None:
+        statement = statement.where(User.first_name == filters.first_name)
+    if filters.last_name is not None:
+        statement = statement.where(User.last_name == filters.last_name)
+    return statement
+
+def users_slice_statement(limit: int, offset: int, filters: UserFilters, fields: Sequence[str] | None = None):
+    sort_column, id_column = col(getattr(User, filters.sort_by)), col(User.id)
+    if filters.order == "desc":
+        sort_column, id_column = sort_column.desc(), id_column.desc()
+    # id breaks ties so pages stay stable when the sort column has duplicates
+    order_by = (sort_column,) if filters.sort_by == "id" else (sort_column, id_column)
+    statement = select_columns(*user_columns(fields)) if fields else select(User)
+    return filter_users(statement, filters).order_by(*order_by).offset(offset).limit(limit)
+
+def count_users_statement(filters: UserFilters):
+    return filter_users(select(func.count()).select_from(User), filters)
+
+SEARCH_COLUMNS = (User.email, User.first_name, User.last_name)
+
+def search_condition(q: str):
+    return or_(*(col(column).icontains(q, autoescape=True) for column in SEARCH_COLUMNS))
+
+def search_users_statement(q: str, limit: int, offset: int, dialect_name: str):
+    if dialect_name == "postgresql":
+        rank = func.greatest(*(func.similarity(column, q) for column in SEARCH_COLUMNS))
+    else:
+        # Without pg_trgm rank exact matches above prefix matches above other substring matches
+        rank = case(
+            (or_(*(func.lower(column) == q.lower() for column in SEARCH_COLUMNS)), 2),
+            (or_(*(col(column).istartswith(q, autoescape=True) for column in SEARCH_COLUMNS)), 1),
+            else_=0,
+        )
+    return select(User).where(search_condition(q)).order_by(rank.desc(), col(User.id)).offset(offset).limit(limit)
+
+def search_count_statement(q: str):
+    return select(func.count()).select_from(User).where(search_condition(q))
+
+def search_users(session: Session, q: str, limit: int, offset: int) -> Sequence[User]:
+    statement = search_users_statement(q, limit, offset, session.get_bind().dialect.name)
+    return session.exec(statement).all()
+
+def count_search_results(session: Session, q: str) -> int:
+    return session.exec(search_count_statement(q)).one()
+
+def get_users_slice(session: Session, limit: int, offset: int, filters: UserFilters = UserFilters()) -> Sequence[User]:
+    return session.exec(users_slice_statement(limit, offset, filters)).all()
+
+def users_after_statement(last_id: int | None, limit: int):
+    statement = select(User).order_by(User.id).limit(limit)
+    if last_id is not None:
+        statement = statement.where(User.id > last_id)
+    return statement
 
-def create_user(user: UserCreate) -> User:
+def get_users_after(session: Session, last_id: int | None, limit: int) -> Sequence[User]:
+    return session.exec(users_after_statement(last_id, limit)).all()
+
+ESTIMATED_COUNT_STATEMENT = text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table_name AS regclass)")
+
+def get_users_slice_fields(
+        session: Session,
+        limit: int,
+        offset: int,
+        fields: Sequence[str],
+        filters: UserFilters = UserFilters()
+) -> list[dict]:
+    statement = users_slice_statement(limit, offset, filters, fields)
+    return [dict(row) for row in session.exec(statement).mappings()]
+
+def count_users(session: Session, filters: UserFilters = UserFilters()) -> int:
+    return session.exec(count_users_statement(filters)).one()
+
+def estimate_users_count(session: Session) -> int | None:
+    if session.get_bind().dialect.name != "postgresql":
+        return None
+    estimate = session.scalar(ESTIMATED_COUNT_STATEMENT, {"table_name": f'"{User.__tablename__}"'})
+    # reltuples is -1 (or 0 before PostgreSQL 14) until the table has been vacuumed or analyzed
+    return estimate if estimate and estimate > 0 else None
+
+def existing_emails_statement(emails: Sequence[str]):
+    return select(User.email).where(col(User.email).in_(emails))
+
+def get_existing_emails(session: Session, emails: Sequence[str]) -> set[str]:
+    return set(session.exec(existing_emails_statement(emails)).all())
+
+def create_user(session: Session, user: UserCreate) -> User:
     new_user = User(**user.model_dump(mode="json"))
-    with Session(engine) as session:
-        session.add(new_user)
-        session.commit()
-        session.refresh(new_user)
-        return new_user
+    session.add(new_user)
+    session.flush()
+    users_count_changed(session)
+    return new_user
 
-def update_user(user_id: int, user: UserUpdate) -> type[User]:
-    with Session(engine) as session:
-        db_user = session.get(User, user_id)
-        if not db_user:
-            raise HTTPException(status_code=404, detail="User not found")
-        user_data = user.model_dump(exclude_unset=True, mode="json")
-        db_user.sqlmodel_update(user_data)
-        session.add(db_user)
-        session.commit()
-        session.refresh(db_user)
-        return db_user
-
-def delete_user(user_id: int):
-    with Session(engine) as session:
-        user = session.get(User, user_id)
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-        session.delete(user)
-        session.commit()
\ No newline at end of file
+def create_users_statement():
+    # Executed with a list of parameter sets; ids come back in the order of the rows
+    return insert(User).returning(User.id, sort_by_parameter_order=True)
+
+def create_users(session: Session, new_users: Sequence[UserCreate], batch_size: int = 1000) -> list[User]:
+    created = []
+    for start in range(0, len(new_users), batch_size):
+        batch = [user.model_dump(mode="json") for user in new_users[start:start + batch_size]]
+        user_ids = session.scalars(create_users_statement(), batch).all()
+        created.extend(User(id=user_id, **user_data) for user_id, user_data in zip(user_ids, batch))
+    if created:
+        users_count_changed(session)
+    return created
+
+def update_user_statement(user_id: int, user: UserUpdate):
+    user_data = user.model_dump(exclude_unset=True, mode="json")
+    return (
+        update(User)
+        .where(User.id == user_id)
+        .values(**user_data, version=User.version + 1)
+        .returning(User)
+        .execution_options(populate_existing=True)
+    )
+
+def update_user(session: Session, user_id: int, user: UserUpdate) -> User | None:
+    db_user = session.scalars(update_user_statement(user_id, user)).one_or_none()
+    invalidate_users(session, [user_id])
+    return db_user
+
+def update_users_statement(user_ids: Sequence[int], user: UserUpdate):
+    user_data = user.model_dump(exclude_unset=True, mode="json")
+    return update(User).where(col(User.id).in_(user_ids)).values(**user_data, version=User.version + 1).returning(User.id)
+
+def update_users(session: Session, user_ids: Sequence[int], user: UserUpdate) -> Sequence[int]:
+    updated_ids = session.scalars(update_users_statement(user_ids, user)).all()
+    invalidate_users(session, updated_ids)
+    return updated_ids
+
+def delete_users_statement(user_ids: Sequence[int]):
+    return delete(User).where(col(User.id).in_(user_ids)).returning(User.id)
+
+def delete_users(session: Session, user_ids: Sequence[int]) -> Sequence[int]:
+    deleted_ids = session.scalars(delete_users_statement(user_ids)).all()
+    invalidate_users(session, deleted_ids)
+    if deleted_ids:
+        users_count_changed(session)
+    return deleted_ids
+
+def delete_user(session: Session, user_id: int) -> bool:
+    user = session.get(User, user_id)
+    if not user:
+        return False
+    session.delete(user)
+    session.flush()
+    invalidate_users(session, [user_id])
+    users_count_changed(session)
+    return True
\ No newline at end of file
@@ -1,7 +1,7 @@
 from contextlib import asynccontextmanager
 
 import dotenv
-from app.utils.exception_handlers import http_user_exception_handler
+from app.utils.exception_handlers import http_user_exception_handler, integrity_error_handler
 
 dotenv.load_dotenv()
 
@@ -10,22 +10,35 @@ import uvicorn
 from fastapi import FastAPI, HTTPException
 from fastapi_pagination import add_pagination
 from fastapi.exceptions import RequestValidationError
+from sqlalchemy.exc import IntegrityError
 
-from app.database.engine import create_db_and_tables
+from app.database.engine import create_db_and_tables, dispose_engines
+from app.database.health import database_probe
 from app.routers import status, users
+from app.settings import CompressionSettings
+from app.utils.compression import CompressionMiddleware
+from app.utils.metrics import MetricsMiddleware
+from app.utils.profiling import ProfilingMiddleware
 
 @asynccontextmanager
 async def lifespan(application: FastAPI):
     print("On startup")
     create_db_and_tables()
     add_pagination(application)
+    await database_probe.start()
     yield
     print("On shutdown")
+    await database_probe.stop()
+    await dispose_engines()
 app = FastAPI(lifespan=lifespan)
 app.include_router(status.router)
 app.include_router(users.router)
+app.add_middleware(CompressionMiddleware, config=CompressionSettings())
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 app.add_exception_handler(HTTPException, http_user_exception_handler)
+app.add_exception_handler(IntegrityError, integrity_error_handler)
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
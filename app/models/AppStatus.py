@@ -1,4 +1,12 @@
+from datetime import datetime
+
 from pydantic import BaseModel
 
 class AppStatus(BaseModel):
-    database: bool
\ No newline at end of file
+    database: bool
+    database_checked_at: datetime | None = None
+    database_latency_ms: float | None = None
+    pool_saturation: float = 0.0
+
+class LiveStatus(BaseModel):
+    alive: bool = True
\ No newline at end of file
@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+class CacheStatus(BaseModel):
+    backend: str
+    hits: int
+    misses: int
+    size: int | None = None
\ No newline at end of file
@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+
+class HistogramSnapshot(BaseModel):
+    count: int
+    sum: float
+    buckets: dict[str, int]
+
+class PoolStats(BaseModel):
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    timeouts: int
+    wait_seconds: HistogramSnapshot
+
+class PoolStatus(BaseModel):
+    engine: PoolStats
+    async_engine: PoolStats | None = None
+    replicas: dict[str, PoolStats] = {}
\ No newline at end of file
@@ -0,0 +1,7 @@
+from pydantic import BaseModel, NonNegativeFloat
+
+class ProfilingStatus(BaseModel):
+    enabled: bool
+    slow_request_ms: NonNegativeFloat
+    slow_query_ms: NonNegativeFloat
+    server_timing: bool
\ No newline at end of file
@@ -1,12 +1,30 @@
-from pydantic import BaseModel, EmailStr, HttpUrl
+from typing import Any, Literal
+
+from fastapi import Query
+from pydantic import BaseModel, EmailStr, HttpUrl, PositiveInt, field_validator
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
 class User(SQLModel, table=True):
+    __table_args__ = (
+        # Lets PostgreSQL serve "email LIKE 'prefix%'" from an index regardless of the database collation
+        Index("ix_user_email_pattern", "email", postgresql_ops={"email": "varchar_pattern_ops"}).ddl_if(dialect="postgresql"),
+        # Trigram indexes back "ILIKE '%fragment%'" and similarity ranking for /api/users/search (needs pg_trgm)
+        Index("ix_user_email_trgm", "email", postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"}).ddl_if(dialect="postgresql"),
+        Index("ix_user_first_name_trgm", "first_name", postgresql_using="gin", postgresql_ops={"first_name": "gin_trgm_ops"}).ddl_if(dialect="postgresql"),
+        Index("ix_user_last_name_trgm", "last_name", postgresql_using="gin", postgresql_ops={"last_name": "gin_trgm_ops"}).ddl_if(dialect="postgresql"),
+        # SQLite otherwise hands the id of a deleted last row to the next insert, unlike PostgreSQL sequences
+        {"sqlite_autoincrement": True},
+    )
+
     id: int  | None = Field(default=None, primary_key=True)
-    email: EmailStr
-    first_name: str
-    last_name: str
+    email: EmailStr = Field(unique=True, index=True)
+    first_name: str = Field(index=True)
+    last_name: str = Field(index=True)
     avatar: str
+    version: int = Field(default=1, exclude=True, sa_column_kwargs={"server_default": "1"})
+
+USER_FIELDS = tuple(name for name, field in User.model_fields.items() if not field.exclude)
 
 class UserCreate(BaseModel):
     email: EmailStr
@@ -18,4 +36,42 @@ class UserUpdate(BaseModel):
     email: EmailStr | None = None
     first_name: str | None = None
     last_name: str | None = None
-    avatar: HttpUrl | None = None
\ No newline at end of file
+    avatar: HttpUrl | None = None
+
+    @field_validator("*")
+    @classmethod
+    def reject_null(cls, value: Any) -> Any:
+        # Fields may be left out, but every user column is NOT NULL
+        if value is None:
+            raise ValueError("Field may be omitted but not null")
+        return value
+
+class UserFilters(BaseModel):
+    email: str | None = Query(None, description="Exact email")
+    email_prefix: str | None = Query(None, min_length=1, description="Email starts with")
+    first_name: str | None = Query(None, description="Exact first name")
+    last_name: str | None = Query(None, description="Exact last name")
+    sort_by: Literal["id", "email", "first_name", "last_name"] = Query("id", description="Indexed column to sort by")
+    order: Literal["asc", "desc"] = Query("asc", description="Sort direction")
+
+    def has_filters(self) -> bool:
+        return any(value is not None for value in (self.email, self.email_prefix, self.first_name, self.last_name))
+
+class UserBulkError(BaseModel):
+    index: int
+    errors: list[dict[str, Any]]
+
+class UsersBulkCreated(BaseModel):
+    created: list[User]
+    errors: list[UserBulkError]
+
+class UsersBulkUpdate(BaseModel):
+    ids: list[PositiveInt]
+    changes: UserUpdate
+
+class UsersBulkDelete(BaseModel):
+    ids: list[PositiveInt]
+
+class UsersBulkResult(BaseModel):
+    ids: list[int]
+    not_found: list[int]
\ No newline at end of file
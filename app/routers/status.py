@@ -1,10 +1,80 @@
 from http import HTTPStatus
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
 
-from app.database.engine import check_db_availability
-from app.models.AppStatus import AppStatus
+from app.database.engine import get_pool_saturation, get_pool_status, pool_metrics
+from app.database.health import database_probe
+from app.database.instrumentation import db_statement_duration_seconds, db_statement_errors_total
+from app.database.user_cache import user_cache
+from app.database.user_count import users_count_cache
+from app.models.AppStatus import AppStatus, LiveStatus
+from app.models.CacheStatus import CacheStatus
+from app.models.PoolStatus import PoolStatus
+from app.models.ProfilingStatus import ProfilingStatus
+from app.utils.metrics import (
+    CONTENT_TYPE, http_request_duration_seconds, http_requests_in_flight, http_requests_total, render_family
+)
+from app.utils.profiling import profiler
 router = APIRouter()
 
+def app_status() -> AppStatus:
+    return AppStatus(
+        database=database_probe.available,
+        database_checked_at=database_probe.checked_at,
+        database_latency_ms=database_probe.latency_ms,
+        pool_saturation=get_pool_saturation(),
+    )
+
 @router.get("/status", status_code=HTTPStatus.OK)
-def status() -> AppStatus:
-    return AppStatus(database=check_db_availability())
+async def status() -> AppStatus:
+    return app_status()
+
+@router.get("/live", status_code=HTTPStatus.OK)
+async def live() -> LiveStatus:
+    return LiveStatus()
+
+@router.get("/ready", status_code=HTTPStatus.OK, responses={HTTPStatus.SERVICE_UNAVAILABLE: {"model": AppStatus}})
+async def ready(response: Response) -> AppStatus:
+    if not database_probe.is_ready():
+        response.status_code = HTTPStatus.SERVICE_UNAVAILABLE
+    return app_status()
+
+@router.get("/status/pool", status_code=HTTPStatus.OK)
+async def pool_status() -> PoolStatus:
+    return get_pool_status()
+
+@router.get("/status/cache", status_code=HTTPStatus.OK)
+async def cache_status() -> CacheStatus:
+    return user_cache.status()
+
+
+@router.get("/status/profiling", status_code=HTTPStatus.OK)
+async def profiling_status() -> ProfilingStatus:
+    return profiler.status()
+
+@router.put("/status/profiling", status_code=HTTPStatus.OK)
+async def update_profiling(status: ProfilingStatus) -> ProfilingStatus:
+    return profiler.configure(status)
+
+def cache_metrics() -> list[str]:
+    caches = [({"cache": "user"}, user_cache.hits, user_cache.misses), ({"cache": "users_count"}, users_count_cache.hits, users_count_cache.misses)]
+    return [
+        *render_family("cache_hits_total", "counter", "Cache lookups served from the cache", ((labels, hits) for labels, hits, _ in caches)),
+        *render_family("cache_misses_total", "counter", "Cache lookups that fell through to the database", ((labels, misses) for labels, _, misses in caches)),
+        *render_family(
+            "cache_hit_ratio", "gauge", "Share of cache lookups served from the cache",
+            ((labels, hits / (hits + misses) if hits + misses else 0) for labels, hits, misses in caches)
+        ),
+    ]
+
+@router.get("/metrics", status_code=HTTPStatus.OK, response_class=Response)
+async def metrics() -> Response:
+    lines = [
+        *http_requests_total.render(),
+        *http_request_duration_seconds.render(),
+        *http_requests_in_flight.render(),
+        *db_statement_duration_seconds.render(),
+        *db_statement_errors_total.render(),
+        *pool_metrics(),
+        *cache_metrics(),
+    ]
+    return Response("\n".join(lines) + "\n", media_type=CONTENT_TYPE)
\ No newline at end of file
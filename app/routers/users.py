@@ -1,48 +1,206 @@
 from http import HTTPStatus
-from typing import Iterable
-from fastapi import APIRouter, HTTPException, Response
+from typing import Any
+from fastapi import APIRouter, Body, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from fastapi.params import Depends
-from fastapi_pagination import Page, paginate, Params
+from fastapi_pagination import Page, Params, create_page
+from fastapi_pagination.cursor import CursorPage, CursorParams
+from pydantic import ValidationError
 
-from app.database import users
-from app.models.User import User, UserCreate, UserUpdate
+from app.database import async_users as users
+from app.database.session import AnySession, get_session
+from app.models.User import (
+    USER_FIELDS, User, UserCreate, UserUpdate, UserFilters, UserBulkError, UsersBulkCreated, UsersBulkUpdate, UsersBulkDelete, UsersBulkResult
+)
+from app.utils.etag import user_etag, users_page_etag, etag_matches, not_modified
+from app.settings import ResponseSettings
+from app.utils.fast_json import FastJSONResponse, page_content
+from app.utils.profiling import ProfiledRoute
+from app.utils.streaming import json_array_chunks, ndjson_chunks, dump_row, dump_rows
 
-router = APIRouter(prefix="/api/users")
+router = APIRouter(prefix="/api/users", route_class=ProfiledRoute)
 
-@router.get("/all", status_code=HTTPStatus.OK)
-def get_all_users() -> Iterable[User]:
-    return users.get_users()
+response_config = ResponseSettings()
+
+class UserCursorParams(CursorParams):
+    size: int = Query(50, ge=1, le=100, description="Page size")
+
+def decode_user_cursor(cursor: str | None) -> int | None:
+    if cursor is None:
+        return None
+    try:
+        return int(cursor)
+    except ValueError:
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail="Invalid cursor value")
+
+def user_fields(
+        fields: str | None = Query(None, description=f"Comma-separated subset of: {', '.join(USER_FIELDS)}")
+) -> tuple[str, ...] | None:
+    if fields is None:
+        return None
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested.difference(USER_FIELDS)
+    if unknown:
+        raise HTTPException(status_code=HTTPStatus.UNPROCESSABLE_ENTITY, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    if not requested:
+        raise HTTPException(status_code=HTTPStatus.UNPROCESSABLE_ENTITY, detail="No fields requested")
+    return tuple(field for field in USER_FIELDS if field in requested)
+
+@router.get("/all", status_code=HTTPStatus.OK, response_model=list[User])
+async def get_all_users(fields: tuple[str, ...] | None = Depends(user_fields)) -> StreamingResponse:
+    if fields is not None or response_config.fast_json:
+        chunks = json_array_chunks(users.iterate_user_row_batches(fields or USER_FIELDS), dump_batch=dump_rows)
+    else:
+        chunks = json_array_chunks(users.iterate_user_batches())
+    return StreamingResponse(chunks, media_type="application/json")
+
+@router.get("/export", status_code=HTTPStatus.OK, response_model=list[User])
+async def export_users(fields: tuple[str, ...] | None = Depends(user_fields)) -> StreamingResponse:
+    if fields is not None or response_config.fast_json:
+        chunks = ndjson_chunks(users.iterate_user_row_batches(fields or USER_FIELDS), dump=dump_row)
+    else:
+        chunks = ndjson_chunks(users.iterate_user_batches())
+    return StreamingResponse(chunks, media_type="application/x-ndjson")
+
+@router.get("/cursor", status_code=HTTPStatus.OK, response_model=CursorPage[User])
+async def get_users_by_cursor(
+        response: Response,
+        params: UserCursorParams = Depends(),
+        if_none_match: str | None = Header(None),
+        session: AnySession = Depends(get_session)
+) -> CursorPage[User]:
+    raw_params = params.to_raw_params().as_cursor()
+    last_id = decode_user_cursor(raw_params.cursor)
+    items = await users.get_users_after(session, last_id, limit=raw_params.size + 1)
+    has_next = len(items) > raw_params.size
+    etag = users_page_etag(items, raw_params.cursor, raw_params.size)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    items = items[:raw_params.size]
+    next_cursor = str(items[-1].id) if has_next else None
+    return create_page(items, params=params, current=raw_params.cursor, next_=next_cursor)
+
+@router.get("/search", status_code=HTTPStatus.OK, response_model=Page[User])
+async def search_users(
+        q: str = Query(min_length=3, description="Fragment of email, first name or last name"),
+        params: Params = Depends(),
+        session: AnySession = Depends(get_session)
+) -> Page[User]:
+    raw_params = params.to_raw_params().as_limit_offset()
+    items = await users.search_users(session, q, limit=raw_params.limit, offset=raw_params.offset)
+    return create_page(items, total=await users.count_search_results(session, q), params=params)
 
 @router.get("/{user_id}", status_code=HTTPStatus.OK)
-def get_user(user_id: int) -> User:
+async def get_user(
+        user_id: int,
+        response: Response,
+        if_none_match: str | None = Header(None),
+        fields: tuple[str, ...] | None = Depends(user_fields),
+        session: AnySession = Depends(get_session)
+) -> User:
     if user_id < 1:
         raise HTTPException(status_code=HTTPStatus.UNPROCESSABLE_ENTITY, detail="Invalid user id")
 
-    user = users.get_user(user_id)
+    if fields is not None:
+        partial_user = await users.get_user_fields(session, user_id, fields)
+        if not partial_user:
+            raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="User not found")
+        return FastJSONResponse(partial_user)
+
+    user = await users.get_user(session, user_id)
     if not user:
         raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="User not found")
 
+    etag = user_etag(user)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
     return user
 
 @router.get("/", status_code=HTTPStatus.OK, response_model=Page[User])
-def get_users(params: Params = Depends()) -> Iterable[User]:
-    return paginate(users.get_users(), params)
+async def get_users(
+        response: Response,
+        params: Params = Depends(),
+        filters: UserFilters = Depends(),
+        if_none_match: str | None = Header(None),
+        fields: tuple[str, ...] | None = Depends(user_fields),
+        session: AnySession = Depends(get_session)
+) -> Page[User]:
+    raw_params = params.to_raw_params().as_limit_offset()
+    if fields is not None:
+        items = await users.get_users_slice_fields(session, raw_params.limit, raw_params.offset, fields, filters)
+        total = await users.count_users(session, filters)
+        return FastJSONResponse(page_content(items, total, params.page, params.size))
+    if response_config.fast_json:
+        rows = await users.get_users_slice_fields(session, raw_params.limit, raw_params.offset, USER_FIELDS + ("version",), filters)
+        total = await users.count_users(session, filters)
+        etag = users_page_etag(rows, params.page, params.size, total, filters.model_dump_json())
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        for row in rows:
+            del row["version"]
+        return FastJSONResponse(page_content(rows, total, params.page, params.size), headers={"ETag": etag})
+    items = await users.get_users_slice(session, limit=raw_params.limit, offset=raw_params.offset, filters=filters)
+    total = await users.count_users(session, filters)
+    etag = users_page_etag(items, params.page, params.size, total, filters.model_dump_json())
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    return create_page(items, total=total, params=params)
 
 @router.post("/", status_code=HTTPStatus.CREATED)
-def create_user(user_create: UserCreate) -> User:
+async def create_user(user_create: UserCreate, session: AnySession = Depends(get_session)) -> User:
     UserCreate.model_validate(user_create.model_dump())
-    return users.create_user(user_create)
+    return await users.create_user(session, user_create)
+
+@router.post("/bulk", status_code=HTTPStatus.CREATED)
+async def create_users_bulk(payload: list[Any] = Body(), session: AnySession = Depends(get_session)) -> UsersBulkCreated:
+    valid_users, errors = {}, []
+    for index, item in enumerate(payload):
+        try:
+            valid_users[index] = UserCreate.model_validate(item)
+        except ValidationError as error:
+            errors.append(UserBulkError(index=index, errors=error.errors(include_url=False, include_context=False)))
+
+    taken_emails = await users.get_existing_emails(session, [user.email for user in valid_users.values()])
+    for index, user in list(valid_users.items()):
+        if user.email in taken_emails:
+            del valid_users[index]
+            errors.append(UserBulkError(index=index, errors=[{"loc": ["email"], "msg": "User with this email already exists", "type": "unique"}]))
+        taken_emails.add(user.email)
+
+    created = await users.create_users(session, list(valid_users.values()))
+    return UsersBulkCreated(created=created, errors=sorted(errors, key=lambda error: error.index))
+
+@router.patch("/bulk", status_code=HTTPStatus.OK)
+async def update_users_bulk(users_update: UsersBulkUpdate, session: AnySession = Depends(get_session)) -> UsersBulkResult:
+    if not users_update.changes.model_fields_set:
+        raise HTTPException(status_code=HTTPStatus.UNPROCESSABLE_ENTITY, detail="No fields to update")
+    user_ids = set(users_update.ids)
+    updated_ids = await users.update_users(session, list(user_ids), users_update.changes) if user_ids else []
+    return UsersBulkResult(ids=sorted(updated_ids), not_found=sorted(user_ids.difference(updated_ids)))
+
+@router.delete("/bulk", status_code=HTTPStatus.OK)
+async def delete_users_bulk(users_delete: UsersBulkDelete, session: AnySession = Depends(get_session)) -> UsersBulkResult:
+    user_ids = set(users_delete.ids)
+    deleted_ids = await users.delete_users(session, list(user_ids)) if user_ids else []
+    return UsersBulkResult(ids=sorted(deleted_ids), not_found=sorted(user_ids.difference(deleted_ids)))
 
 @router.patch("/{user_id}", status_code=HTTPStatus.OK)
-def update_user(user_update: UserUpdate, user_id: int) -> User:
+async def update_user(user_update: UserUpdate, user_id: int, session: AnySession = Depends(get_session)) -> User:
     if user_id < 1:
         raise HTTPException(status_code=HTTPStatus.UNPROCESSABLE_ENTITY)
-    UserUpdate.model_validate(user_update.model_dump(mode="json"))
-    return users.update_user(user_id, user_update)
+    UserUpdate.model_validate(user_update.model_dump(mode="json", exclude_unset=True))
+    user = await users.update_user(session, user_id, user_update)
+    if not user:
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="User not found")
+    return user
 
 @router.delete("/{user_id}", status_code=HTTPStatus.NO_CONTENT)
-def delete_user(user_id: int) -> Response:
+async def delete_user(user_id: int, session: AnySession = Depends(get_session)) -> Response:
     if user_id < 1:
         raise HTTPException(status_code=HTTPStatus.UNPROCESSABLE_ENTITY)
-    users.delete_user(user_id)
+    if not await users.delete_user(session, user_id):
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="User not found")
     return Response(status_code=204)
@@ -0,0 +1,82 @@
+from typing import Literal
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+class DatabaseSettings(BaseSettings):
+    engine: str
+    async_engine: str | None = None
+    pool_size: int = 10
+    max_overflow: int = 10
+    pool_timeout: float = 30
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    pool_use_lifo: bool = False
+    statement_timeout_ms: int | None = None
+    # PgBouncer in transaction mode drops startup parameters and breaks server-side prepared statements
+    pgbouncer: bool = False
+    # Comma-separated read replica URLs for the sync and async engines; reads fall back to the primary without them
+    replicas: str = ""
+    async_replicas: str = ""
+
+    model_config = SettingsConfigDict(env_prefix="DATABASE_", env_file=".env", env_ignore_empty=True, extra="ignore")
+
+    def replica_list(self) -> list[str]:
+        return [url.strip() for url in self.replicas.split(",") if url.strip()]
+
+    def async_replica_list(self) -> list[str]:
+        return [url.strip() for url in self.async_replicas.split(",") if url.strip()]
+
+class UserCacheSettings(BaseSettings):
+    backend: Literal["none", "memory", "redis"] = "none"
+    max_entries: int = 10_000
+    ttl_seconds: float = 60
+    redis_url: str = "redis://localhost:6379/0"
+
+    model_config = SettingsConfigDict(env_prefix="USER_CACHE_", env_file=".env", env_ignore_empty=True, extra="ignore")
+
+class UsersCountSettings(BaseSettings):
+    # exact: COUNT(*) per request; cached: COUNT(*) kept for ttl_seconds and dropped on create/delete;
+    # estimated: pg_class.reltuples on PostgreSQL, exact elsewhere
+    strategy: Literal["exact", "cached", "estimated"] = "exact"
+    ttl_seconds: float = 30
+
+    model_config = SettingsConfigDict(env_prefix="USERS_COUNT_", env_file=".env", env_ignore_empty=True, extra="ignore")
+
+class ResponseSettings(BaseSettings):
+    # Serve user listings from raw rows through orjson instead of validating every User via response_model
+    fast_json: bool = False
+
+    model_config = SettingsConfigDict(env_prefix="RESPONSE_", env_file=".env", env_ignore_empty=True, extra="ignore")
+
+class CompressionSettings(BaseSettings):
+    # Comma-separated, in server preference order ("identity" disables compression);
+    # encodings whose module is not installed are skipped
+    encodings: str = "zstd,br,gzip"
+    minimum_size: int = 1024
+    gzip_level: int = 6
+    brotli_quality: int = 4
+    zstd_level: int = 3
+
+    model_config = SettingsConfigDict(env_prefix="COMPRESSION_", env_file=".env", env_ignore_empty=True, extra="ignore")
+
+    def encoding_list(self) -> list[str]:
+        return [encoding.strip().lower() for encoding in self.encodings.split(",") if encoding.strip()]
+
+class HealthSettings(BaseSettings):
+    # /status and /ready serve the last background probe result instead of querying the database per hit
+    probe_interval_seconds: float = 5
+    probe_timeout_seconds: float = 2
+    # A probe result older than this many intervals (e.g. the probe loop is stuck) counts as not ready
+    max_staleness_intervals: int = 3
+
+    model_config = SettingsConfigDict(env_prefix="HEALTH_", env_file=".env", env_ignore_empty=True, extra="ignore")
+
+class ProfilingSettings(BaseSettings):
+    # Initial state; it can be changed at runtime through PUT /status/profiling
+    enabled: bool = False
+    slow_request_ms: float = 500
+    slow_query_ms: float = 100
+    server_timing: bool = False
+    max_logged_statements: int = 50
+
+    model_config = SettingsConfigDict(env_prefix="PROFILING_", env_file=".env", env_ignore_empty=True, extra="ignore")
\ No newline at end of file
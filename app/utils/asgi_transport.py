@@ -0,0 +1,99 @@
+import io
+import os
+import shutil
+import tempfile
+from http import HTTPStatus
+
+from requests import PreparedRequest, Response
+from requests.adapters import HTTPAdapter
+from starlette.testclient import TestClient
+from urllib3 import HTTPResponse
+from urllib3._collections import HTTPHeaderDict
+
+IN_PROCESS_BASE_URL = "http://testserver"
+
+
+class InProcessApp:
+    """Runs app.main:app inside the current process on a SQLite database in a temporary directory.
+
+    The lifespan runs once, on start(); every in-process session then talks to the same app until stop(),
+    which also removes the database. A file database gets a real connection pool, so concurrent requests
+    run in their own transactions as they do against a served app. With async_engine, requests go through an
+    aiosqlite engine on the same file, as with DATABASE_ASYNC_ENGINE; the sync engine still creates the tables.
+    """
+
+    def __init__(self):
+        self.client: TestClient | None = None
+        self.directory: str | None = None
+
+    def start(self, async_engine: bool = False) -> TestClient:
+        if self.client is not None:
+            return self.client
+        # The engine reads its settings on import, so the database has to be chosen before app.main is loaded
+        self.directory = tempfile.mkdtemp(prefix="users-inproc-")
+        database_path = os.path.join(self.directory, "users.db")
+        database_url = f"sqlite:///{database_path}"
+        async_database_url = f"sqlite+aiosqlite:///{database_path}" if async_engine else None
+        os.environ["DATABASE_ENGINE"] = database_url
+        if async_database_url is not None:
+            os.environ["DATABASE_ASYNC_ENGINE"] = async_database_url
+        else:
+            os.environ.pop("DATABASE_ASYNC_ENGINE", None)
+        for name in ("DATABASE_REPLICAS", "DATABASE_ASYNC_REPLICAS"):
+            os.environ.pop(name, None)
+        from app.database import engine as database
+        from app.main import app
+
+        started_async_url = database.async_engine.url.render_as_string() if database.async_engine is not None else None
+        if database.engine.url.render_as_string() != database_url or started_async_url != async_database_url or database.replica_set:
+            raise RuntimeError(
+                "The in-process app needs its own SQLite engine only: app.database.engine was imported "
+                "before InProcessApp.start(), or DATABASE_ASYNC_ENGINE or DATABASE_REPLICAS is set in .env"
+            )
+        # requests follows redirects itself, as it does against a real server
+        self.client = TestClient(app, base_url=IN_PROCESS_BASE_URL, follow_redirects=False).__enter__()
+        return self.client
+
+    def stop(self) -> None:
+        if self.client is not None:
+            self.client.__exit__(None, None, None)
+            self.client = None
+        if self.directory is not None:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self.directory = None
+
+in_process_app = InProcessApp()
+
+
+class ASGIAdapter(HTTPAdapter):
+    """requests transport adapter that hands requests to the in-process app instead of opening a socket.
+
+    The response body arrives still encoded, so requests decompresses it exactly as it would over HTTP.
+    Streaming responses are buffered by the ASGI test transport before they are returned.
+    """
+
+    def __init__(self, client: TestClient):
+        super().__init__()
+        self.client = client
+
+    def send(self, request: PreparedRequest, stream: bool = False, timeout=None, verify=True, cert=None, proxies=None) -> Response:
+        with self.client.stream(request.method, request.url, content=request.body, headers=list(request.headers.items())) as asgi_response:
+            body = b"".join(asgi_response.iter_raw())
+
+        headers = HTTPHeaderDict()
+        for name, value in asgi_response.headers.multi_items():
+            headers.add(name, value)
+        raw = HTTPResponse(
+            body=io.BytesIO(body),
+            headers=headers,
+            status=asgi_response.status_code,
+            reason=HTTPStatus(asgi_response.status_code).phrase,
+            preload_content=False,
+            decode_content=True,
+            request_method=request.method,
+            request_url=request.url,
+        )
+        response = self.build_response(request, raw)
+        if not stream:
+            response.content
+        return response
\ No newline at end of file
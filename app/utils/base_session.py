@@ -1,21 +1,100 @@
 import logging
+import os
+from collections import OrderedDict
+from http import HTTPStatus
 
 import curlify
 from requests import Session, Response
+from requests.adapters import HTTPAdapter
+from requests.models import PreparedRequest
+from requests.utils import get_environ_proxies, get_netrc_auth
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+from settings import ClientSettings
+
+logger = logging.getLogger(__name__)
+
+def retry_policy(config: ClientSettings) -> Retry:
+    # urllib3 only retries read errors and retry statuses for Retry.DEFAULT_ALLOWED_METHODS (the idempotent ones);
+    # connect errors are retried for every method, since the request never reached the server
+    return Retry(
+        total=config.retries,
+        backoff_factor=config.retry_backoff,
+        status_forcelist=config.retry_status_list(),
+        raise_on_status=False,
+    )
 
 
 class BaseSession(Session):
     def __init__(self, *args, **kwargs):
         super().__init__()
+        config = kwargs.get("config") or ClientSettings()
         self.base_url = kwargs.get("base_url", None)
+        self.timeout = kwargs.get("timeout", (config.connect_timeout, config.read_timeout))
+        adapter = HTTPAdapter(
+            pool_connections=kwargs.get("pool_connections", config.pool_connections),
+            pool_maxsize=kwargs.get("pool_maxsize", config.pool_maxsize),
+            max_retries=kwargs.get("retries", retry_policy(config)),
+        )
+        self.mount("http://", adapter)
+        self.mount("https://", adapter)
+        if self.base_url:
+            # requests re-reads proxies, the CA bundle and ~/.netrc from the environment on every request, which
+            # costs more than the rest of the client side; the session only talks to base_url, so resolve them once
+            self.proxies.update(get_environ_proxies(self.base_url))
+            self.verify = os.environ.get("REQUESTS_CA_BUNDLE") or os.environ.get("CURL_CA_BUNDLE") or self.verify
+            self.auth = get_netrc_auth(self.base_url)
+            self.trust_env = False
+        self.etag_cache: OrderedDict[str, Response] | None = OrderedDict() if kwargs.get("etag_cache", True) else None
+        self.etag_cache_size = kwargs.get("etag_cache_size", 1024)
+        # Advertise every encoding urllib3 can decode here (gzip, deflate, plus br/zstd when brotli/zstandard are installed)
+        self.headers["Accept-Encoding"] = ACCEPT_ENCODING if kwargs.get("compression", True) else "identity"
+        if kwargs.get("in_process", False):
+            # Imported lazily: it loads app.main together with its database engine
+            from app.utils.asgi_transport import ASGIAdapter, in_process_app
+
+            self.mount(self.base_url, ASGIAdapter(in_process_app.start()))
 
     def request(self, method: str, path: str, **kwargs) -> Response:
         url = self.base_url + path
 
+        cache_key, cached = None, None
+        if self._revalidates(method, kwargs):
+            request = PreparedRequest()
+            request.prepare_url(url, kwargs.get("params"))
+            cache_key = request.url
+            cached = self.etag_cache.get(cache_key)
+            if cached is not None:
+                kwargs["headers"] = {**(kwargs.get("headers") or {}), "If-None-Match": cached.headers["ETag"]}
+
+        kwargs.setdefault("timeout", self.timeout)
         response = super().request(method, url, **kwargs)
 
-        curl = curlify.to_curl(response.request)
-        logging.info(curl)
+        # The curl command is only built when INFO is enabled for this logger
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(curlify.to_curl(response.request))
+
+        if cache_key is not None:
+            return self._update_etag_cache(cache_key, cached, response)
+        return response
+
+    def _revalidates(self, method: str, kwargs: dict) -> bool:
+        if self.etag_cache is None or method.upper() != "GET" or kwargs.get("stream"):
+            return False
+        headers = kwargs.get("headers") or {}
+        return "if-none-match" not in {name.lower() for name in headers}
 
+    def _update_etag_cache(self, cache_key: str, cached: Response | None, response: Response) -> Response:
+        if response.status_code == HTTPStatus.NOT_MODIFIED and cached is not None:
+            self.etag_cache.move_to_end(cache_key)
+            return cached
+        if response.status_code == HTTPStatus.OK and "ETag" in response.headers:
+            self.etag_cache[cache_key] = response
+            self.etag_cache.move_to_end(cache_key)
+            while len(self.etag_cache) > self.etag_cache_size:
+                self.etag_cache.popitem(last=False)
+        else:
+            self.etag_cache.pop(cache_key, None)
         return response
 
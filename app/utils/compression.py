@@ -0,0 +1,184 @@
+import importlib.util
+import zlib
+from typing import Callable, Protocol, Sequence
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.settings import CompressionSettings
+
+EXCLUDED_CONTENT_TYPES = ("text/event-stream",)
+SKIPPED_STATUS_CODES = (204, 304)
+
+
+class Compressor(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+    def finish(self) -> bytes: ...
+
+
+class GzipCompressor:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliCompressor:
+    def __init__(self, quality: int):
+        import brotli
+
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdCompressor:
+    def __init__(self, level: int):
+        import zstandard
+
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+        self._flush_block = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(self._flush_block)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+# encoding -> module it needs (None for the standard library)
+ENCODING_MODULES = {"zstd": "zstandard", "br": "brotli", "gzip": None}
+
+def available_encodings(encodings: Sequence[str]) -> list[str]:
+    return [
+        encoding for encoding in encodings
+        if encoding in ENCODING_MODULES
+        and (ENCODING_MODULES[encoding] is None or importlib.util.find_spec(ENCODING_MODULES[encoding]) is not None)
+    ]
+
+def compressor_factories(config: CompressionSettings) -> dict[str, Callable[[], Compressor]]:
+    factories = {
+        "zstd": lambda: ZstdCompressor(config.zstd_level),
+        "br": lambda: BrotliCompressor(config.brotli_quality),
+        "gzip": lambda: GzipCompressor(config.gzip_level),
+    }
+    return {encoding: factories[encoding] for encoding in available_encodings(config.encoding_list())}
+
+def choose_encoding(accept_encoding: str, encodings: Sequence[str]) -> str | None:
+    accepted = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.partition(";")
+        name, params = name.strip().lower(), params.strip().lower()
+        try:
+            quality = float(params[2:]) if params.startswith("q=") else 1.0
+        except ValueError:
+            quality = 0.0
+        if name:
+            accepted[name] = quality
+
+    # Server preference order wins among the encodings the client accepts with the highest quality
+    best, best_quality = None, 0.0
+    for encoding in encodings:
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, config: CompressionSettings) -> None:
+        self.app = app
+        self.minimum_size = config.minimum_size
+        self.factories = compressor_factories(config)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""), list(self.factories)) if scope["type"] == "http" else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = CompressionResponder(send, encoding, self.factories[encoding], self.minimum_size)
+        await self.app(scope, receive, responder.send)
+
+
+class CompressionResponder:
+    """Buffers the response until it reaches minimum_size, then compresses it.
+
+    Streaming bodies are flushed after every chunk so clients keep receiving data progressively.
+    """
+
+    def __init__(self, send: Send, encoding: str, factory: Callable[[], Compressor], minimum_size: int) -> None:
+        self._send = send
+        self.encoding = encoding
+        self.factory = factory
+        self.minimum_size = minimum_size
+        self.start_message: Message | None = None
+        self.passthrough = False
+        self.compressor: Compressor | None = None
+        self.buffer = bytearray()
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            self.passthrough = (
+                "content-encoding" in headers
+                or headers.get("content-type", "").startswith(EXCLUDED_CONTENT_TYPES)
+                or message["status"] in SKIPPED_STATUS_CODES
+            )
+            if self.passthrough:
+                await self._send(message)
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        body, more_body = message.get("body", b""), message.get("more_body", False)
+        if self.compressor is not None:
+            data = self.compressor.compress(body) + (self.compressor.flush() if more_body else self.compressor.finish())
+            await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
+            return
+
+        self.buffer += body
+        if len(self.buffer) < self.minimum_size:
+            if not more_body:
+                await self._send_start(compressed=False)
+                await self._send({"type": "http.response.body", "body": bytes(self.buffer)})
+            return
+
+        self.compressor = self.factory()
+        data = self.compressor.compress(bytes(self.buffer))
+        data += self.compressor.flush() if more_body else self.compressor.finish()
+        self.buffer.clear()
+        await self._send_start(compressed=True, content_length=None if more_body else len(data))
+        await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    async def _send_start(self, compressed: bool, content_length: int | None = None) -> None:
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers.add_vary_header("Accept-Encoding")
+        if compressed:
+            headers["Content-Encoding"] = self.encoding
+            if content_length is None:
+                del headers["Content-Length"]
+            else:
+                headers["Content-Length"] = str(content_length)
+        await self._send(self.start_message)
@@ -0,0 +1,34 @@
+import hashlib
+from http import HTTPStatus
+from typing import Any, Iterable, Mapping
+
+from fastapi import Response
+
+from app.models.User import User
+
+
+def user_fingerprint(user: User | Mapping[str, Any]) -> str:
+    # Every UPDATE bumps version and ids are never reused (AUTOINCREMENT on SQLite), so this changes with the content
+    if isinstance(user, User):
+        return f"{user.id}-{user.version}"
+    return f"{user['id']}-{user['version']}"
+
+def user_etag(user: User) -> str:
+    return f'W/"{user_fingerprint(user)}"'
+
+def users_page_etag(users: Iterable[User | Mapping[str, Any]], *parts: object) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(f"{part};".encode())
+    for user in users:
+        digest.update(f"{user_fingerprint(user)},".encode())
+    return f'W/"{digest.hexdigest()}"'
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=HTTPStatus.NOT_MODIFIED, headers={"ETag": etag})
\ No newline at end of file
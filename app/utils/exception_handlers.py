@@ -2,9 +2,24 @@ from fastapi import Request, HTTPException
 from fastapi.responses import JSONResponse
 from http import HTTPStatus
 from fastapi.exceptions import RequestValidationError
+from sqlalchemy.exc import IntegrityError
+
+from app.database.constraints import EMAIL_INDEX, is_unique_violation
 
 async def http_user_exception_handler(request: Request, exc: HTTPException):
     return JSONResponse(
         status_code=exc.status_code,
         content={"message": f"{exc.detail}"},
+    )
+
+async def integrity_error_handler(request: Request, exc: IntegrityError):
+    # Only a taken email is a conflict; other constraints are caught by validation, so reaching one here is a bad request
+    if is_unique_violation(exc, EMAIL_INDEX):
+        return JSONResponse(
+            status_code=HTTPStatus.CONFLICT,
+            content={"message": "User with this email already exists"},
+        )
+    return JSONResponse(
+        status_code=HTTPStatus.UNPROCESSABLE_ENTITY,
+        content={"message": "Request violates a database constraint"},
     )
\ No newline at end of file
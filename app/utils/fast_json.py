@@ -0,0 +1,26 @@
+import json
+from typing import Any, Mapping
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    # Produces the same bytes as starlette's JSONResponse (compact separators, UTF-8, no ASCII escaping)
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+def page_content(items: list[Mapping[str, Any]], total: int, page: int, size: int) -> dict[str, Any]:
+    # Mirrors fastapi_pagination's Page so fast responses keep the same shape and key order
+    pages = -(-total // size) if size else 0
+    return {"items": items, "total": total, "page": page, "size": size, "pages": pages}
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
\ No newline at end of file
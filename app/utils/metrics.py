@@ -0,0 +1,125 @@
+import threading
+import time
+from typing import Iterable, Sequence
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.histogram import DEFAULT_BUCKETS, Histogram
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = dict[str, str]
+
+
+def escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{escape_label_value(str(value))}"' for name, value in labels.items()) + "}"
+
+def format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+def render_family(name: str, kind: str, documentation: str, samples: Iterable[tuple[Labels, float]]) -> list[str]:
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    lines.extend(f"{name}{format_labels(labels)} {format_value(value)}" for labels, value in samples)
+    return lines
+
+def render_histogram_family(name: str, documentation: str, samples: Iterable[tuple[Labels, dict]]) -> list[str]:
+    # samples carry Histogram.snapshot() dicts, whose buckets are already cumulative
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} histogram"]
+    for labels, snapshot in samples:
+        for bound, count in snapshot["buckets"].items():
+            lines.append(f"{name}_bucket{format_labels({**labels, 'le': bound})} {count}")
+        lines.append(f"{name}_sum{format_labels(labels)} {format_value(snapshot['sum'])}")
+        lines.append(f"{name}_count{format_labels(labels)} {snapshot['count']}")
+    return lines
+
+
+class HistogramFamily:
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str], buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = buckets
+        self._histograms: dict[tuple[str, ...], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str) -> Histogram:
+        histogram = self._histograms.get(values)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(values, Histogram(self.buckets))
+        return histogram
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._histograms.items())
+        samples = ((dict(zip(self.label_names, values)), histogram.snapshot()) for values, histogram in items)
+        return render_histogram_family(self.name, self.documentation, samples)
+
+
+class GaugeFamily:
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *values: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[values] = self._values.get(values, 0) + amount
+
+    def dec(self, *values: str, amount: float = 1) -> None:
+        self.inc(*values, amount=-amount)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return render_family(self.name, self.kind, self.documentation, ((dict(zip(self.label_names, values)), value) for values, value in items))
+
+
+class CounterFamily(GaugeFamily):
+    kind = "counter"
+
+
+http_requests_total = CounterFamily("http_requests_total", "HTTP requests by method, route and status code", ("method", "route", "status"))
+http_request_duration_seconds = HistogramFamily(
+    "http_request_duration_seconds", "HTTP request latency by method, route and status code", ("method", "route", "status")
+)
+http_requests_in_flight = GaugeFamily("http_requests_in_flight", "HTTP requests currently being served")
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_flight.dec()
+            # The route template (e.g. /api/users/{user_id}) keeps label cardinality bounded
+            route = scope.get("route")
+            labels = (scope["method"], getattr(route, "path", "unmatched"), str(status))
+            http_request_duration_seconds.labels(*labels).observe(time.perf_counter() - started)
+            http_requests_total.inc(*labels)
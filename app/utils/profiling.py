@@ -0,0 +1,156 @@
+import functools
+import json
+import logging
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Sized
+
+from fastapi.routing import APIRoute
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.models.ProfilingStatus import ProfilingStatus
+from app.settings import ProfilingSettings
+
+logger = logging.getLogger("app.profiling")
+
+
+class RequestProfile:
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.status: int | None = None
+        self.started = time.perf_counter()
+        self.statements: list[tuple[str, float]] = []
+        self.sql_seconds = 0.0
+        self.orm_objects = 0
+        self.endpoint_finished: float | None = None
+        self.serialization_seconds = 0.0
+
+    def add_statement(self, statement: str, seconds: float) -> None:
+        self.statements.append((statement, seconds))
+        self.sql_seconds += seconds
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def server_timing(self) -> str:
+        return ", ".join((
+            f'sql;dur={self.sql_seconds * 1000:.3f};desc="{len(self.statements)} statements"',
+            f'orm;desc="{self.orm_objects} objects"',
+            f"serialize;dur={self.serialization_seconds * 1000:.3f}",
+            f"total;dur={self.elapsed_ms():.3f}",
+        ))
+
+    def summary(self, duration_ms: float, slow_query_ms: float, max_statements: int) -> dict[str, Any]:
+        return {
+            "event": "slow_request",
+            "method": self.method,
+            "path": self.path,
+            "status": self.status,
+            "duration_ms": round(duration_ms, 3),
+            "sql_ms": round(self.sql_seconds * 1000, 3),
+            "sql_count": len(self.statements),
+            "orm_objects": self.orm_objects,
+            "serialize_ms": round(self.serialization_seconds * 1000, 3),
+            "statements": [
+                {"sql": statement, "duration_ms": round(seconds * 1000, 3), "slow": seconds * 1000 >= slow_query_ms}
+                for statement, seconds in self.statements[:max_statements]
+            ],
+        }
+
+current_profile: ContextVar[RequestProfile | None] = ContextVar("current_profile", default=None)
+
+def count_loaded_objects(objects: Sized) -> None:
+    # Counted from query results rather than a per-row mapper hook, which would run with profiling off too
+    profile = current_profile.get()
+    if profile is not None:
+        profile.orm_objects += len(objects)
+
+
+class Profiler:
+    def __init__(self, config: ProfilingSettings):
+        self.enabled = config.enabled
+        self.slow_request_ms = config.slow_request_ms
+        self.slow_query_ms = config.slow_query_ms
+        self.server_timing = config.server_timing
+        self.max_logged_statements = config.max_logged_statements
+
+    def status(self) -> ProfilingStatus:
+        return ProfilingStatus(
+            enabled=self.enabled,
+            slow_request_ms=self.slow_request_ms,
+            slow_query_ms=self.slow_query_ms,
+            server_timing=self.server_timing,
+        )
+
+    def configure(self, status: ProfilingStatus) -> ProfilingStatus:
+        self.enabled = status.enabled
+        self.slow_request_ms = status.slow_request_ms
+        self.slow_query_ms = status.slow_query_ms
+        self.server_timing = status.server_timing
+        return self.status()
+
+    def report(self, profile: RequestProfile) -> None:
+        duration_ms = profile.elapsed_ms()
+        slow_query_seconds = self.slow_query_ms / 1000
+        if duration_ms >= self.slow_request_ms or any(seconds >= slow_query_seconds for _, seconds in profile.statements):
+            logger.warning(json.dumps(profile.summary(duration_ms, self.slow_query_ms, self.max_logged_statements)))
+
+profiler = Profiler(ProfilingSettings())
+
+
+class ProfilingMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not profiler.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(scope["method"], scope["path"])
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                profile.status = message["status"]
+                if profiler.server_timing:
+                    MutableHeaders(scope=message).append("Server-Timing", profile.server_timing())
+            await send(message)
+
+        token = current_profile.set(profile)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_profile.reset(token)
+            profiler.report(profile)
+
+
+def profiled_endpoint(endpoint: Callable) -> Callable:
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            profile = current_profile.get()
+            if profile is not None:
+                profile.endpoint_finished = time.perf_counter()
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    """Splits the handler time after the endpoint returns (response_model validation and serialization) into the profile."""
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        super().__init__(path, profiled_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def profiled_handler(request):
+            response = await handler(request)
+            profile = current_profile.get()
+            if profile is not None and profile.endpoint_finished is not None:
+                profile.serialization_seconds = time.perf_counter() - profile.endpoint_finished
+            return response
+        return profiled_handler
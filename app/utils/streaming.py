@@ -0,0 +1,35 @@
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Mapping, Sequence
+
+from pydantic import BaseModel
+
+from app.utils.fast_json import dumps
+
+
+def dump_model(item: BaseModel) -> bytes:
+    return item.model_dump_json().encode()
+
+def dump_row(row: Mapping[str, Any]) -> bytes:
+    return dumps(dict(row))
+
+def dump_models(batch: Sequence[BaseModel]) -> bytes:
+    return b",".join(dump_model(item) for item in batch)
+
+def dump_rows(batch: Sequence[Mapping[str, Any]]) -> bytes:
+    # One encoder call per batch; the enclosing brackets are dropped so batches can be joined
+    return dumps([dict(row) for row in batch])[1:-1]
+
+async def json_array_chunks(
+        batches: AsyncIterable[Sequence[Any]],
+        dump_batch: Callable[[Sequence[Any]], bytes] = dump_models
+) -> AsyncIterator[bytes]:
+    yield b"["
+    separator = b""
+    async for batch in batches:
+        if batch:
+            yield separator + dump_batch(batch)
+            separator = b","
+    yield b"]"
+
+async def ndjson_chunks(batches: AsyncIterable[Sequence[Any]], dump: Callable[[Any], bytes] = dump_model) -> AsyncIterator[bytes]:
+    async for batch in batches:
+        yield b"".join(dump(item) + b"\n" for item in batch)
\ No newline at end of file
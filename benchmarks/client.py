@@ -0,0 +1,97 @@
+"""Per-request overhead of the API client (BaseSession) compared with a bare requests.Session.
+
+Requests go to an adapter that answers every call with the same small JSON body, so the timings hold only
+client-side work: URL and header preparation, the ETag cache, curl logging and response building.
+The "INFO on" case builds the curl command for every request, as BaseSession used to regardless of the log level.
+
+With --env, the same GET /live is also sent to a running app over keep-alive connections from the session's pool
+and over a new connection per request.
+
+Usage: python -m benchmarks.client [--requests 20000] [--env dev]
+"""
+import argparse
+import io
+import logging
+import time
+from typing import Callable
+
+from requests import PreparedRequest, Response, Session
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
+
+from app.utils.base_session import BaseSession, logger
+from config import Server
+
+BASE_URL = "http://client-benchmark"
+BODY = b'{"id":1,"email":"george.bluth@reqres.in","first_name":"George","last_name":"Bluth","avatar":"https://reqres.in/img/faces/1-image.jpg"}'
+
+
+class CannedAdapter(HTTPAdapter):
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        raw = HTTPResponse(
+            body=io.BytesIO(BODY),
+            headers={"Content-Type": "application/json", "Content-Length": str(len(BODY))},
+            status=200,
+            preload_content=False,
+        )
+        response = self.build_response(request, raw)
+        response.content
+        return response
+
+
+def canned(session: Session) -> Session:
+    session.mount(BASE_URL, CannedAdapter())
+    return session
+
+def per_request_us(count: int, call: Callable[[], Response]) -> float:
+    for _ in range(min(count, 100)):
+        call()
+    started = time.perf_counter()
+    for _ in range(count):
+        call()
+    return (time.perf_counter() - started) / count * 1_000_000
+
+def client_overhead(count: int) -> list[tuple[str, float]]:
+    plain = canned(Session())
+    base = canned(BaseSession(base_url=BASE_URL))
+    no_etag = canned(BaseSession(base_url=BASE_URL, etag_cache=False))
+    results = [
+        ("requests.Session", per_request_us(count, lambda: plain.get(f"{BASE_URL}/api/users/1"))),
+        ("BaseSession, INFO off", per_request_us(count, lambda: base.get("/api/users/1"))),
+        ("BaseSession, no ETag cache", per_request_us(count, lambda: no_etag.get("/api/users/1"))),
+    ]
+
+    logger.addHandler(logging.NullHandler())
+    logger.propagate, level = False, logger.level
+    logger.setLevel(logging.INFO)
+    try:
+        results.append(("BaseSession, INFO on", per_request_us(count, lambda: base.get("/api/users/1"))))
+    finally:
+        logger.setLevel(level)
+        logger.propagate = True
+    return results
+
+def live_overhead(env: str, count: int) -> list[tuple[str, float]]:
+    base_url = Server(env).base_url
+    pooled = BaseSession(base_url=base_url)
+    return [
+        ("GET /live, keep-alive", per_request_us(count, lambda: pooled.get("/live"))),
+        ("GET /live, new connection", per_request_us(count, lambda: pooled.get("/live", headers={"Connection": "close"}))),
+    ]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--env", help="Also measure GET /live against this running app from config.Server")
+    args = parser.parse_args()
+
+    results = client_overhead(args.requests)
+    if args.env:
+        results += live_overhead(args.env, max(args.requests // 20, 1))
+
+    print(f"{'case':<30}{'us/request':>12}")
+    for name, value in results:
+        print(f"{name:<30}{value:>12.1f}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
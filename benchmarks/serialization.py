@@ -0,0 +1,117 @@
+"""Compares the current users listing serialization with the raw-row fast path (RESPONSE_FAST_JSON).
+
+The current path loads User objects and serializes them through the Page[User] response_model
+(or model_dump_json per user for /all); the fast path selects plain columns and encodes the rows
+in one call. Both run against an in-memory SQLite table so ORM hydration is part of the measurement.
+Outputs are checked to parse to the same JSON; fast items are also checked against the single user
+schema, including its property order (ORM-loaded models dump keys in attribute-load order instead).
+
+Usage: python -m benchmarks.serialization [--rows 1000 100000] [--repeat 5]
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Callable
+
+import jsonschema
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from fastapi_pagination import Page
+from sqlalchemy import insert, select as select_columns
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.models.User import USER_FIELDS, User
+from app.utils.fast_json import dumps, orjson, page_content
+from app.utils.streaming import dump_models, dump_rows
+from schemas.single_user_schema import single_user
+
+BATCH_SIZE = 1000
+
+page_field = create_model_field(name="Response_get_users", type_=Page[User], mode="serialization")
+
+
+def create_users_table(count: int):
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.execute(insert(User), [
+            {
+                "email": f"user{index}@example.com",
+                "first_name": f"First{index}",
+                "last_name": f"Last{index}",
+                "avatar": f"https://example.com/avatars/{index}.png",
+            }
+            for index in range(1, count + 1)
+        ])
+        session.commit()
+    return engine
+
+def users_statement():
+    return select(User).order_by(User.id)
+
+def rows_statement():
+    return select_columns(*(getattr(User, field) for field in USER_FIELDS)).order_by(User.id)
+
+def page_current(engine) -> bytes:
+    with Session(engine) as session:
+        users = session.exec(users_statement()).all()
+    page = Page[User](items=users, total=len(users), page=1, size=len(users), pages=1)
+    return JSONResponse(asyncio.run(serialize_response(field=page_field, response_content=page))).body
+
+def page_fast(engine) -> bytes:
+    with Session(engine) as session:
+        rows = [dict(row) for row in session.exec(rows_statement()).mappings()]
+    return dumps(page_content(rows, len(rows), 1, len(rows)))
+
+def stream_current(engine) -> bytes:
+    with Session(engine) as session:
+        batches = session.exec(users_statement().execution_options(yield_per=BATCH_SIZE)).partitions()
+        return b"[" + b",".join(dump_models(batch) for batch in batches) + b"]"
+
+def stream_fast(engine) -> bytes:
+    with Session(engine) as session:
+        batches = session.exec(rows_statement().execution_options(yield_per=BATCH_SIZE)).mappings().partitions()
+        return b"[" + b",".join(dump_rows(batch) for batch in batches) + b"]"
+
+user_validator = jsonschema.Draft4Validator(single_user)
+
+def check_items(items: list[dict], sample_size: int = 100) -> None:
+    for item in items[:sample_size]:
+        assert user_validator.is_valid(item), f"{item} does not match the single user schema"
+        assert list(item) == list(single_user["properties"]), f"Unexpected key order {list(item)}"
+
+def best_of(repeat: int, func: Callable, engine) -> tuple[float, bytes]:
+    timings, output = [], b""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        output = func(engine)
+        timings.append(time.perf_counter() - started)
+    return min(timings), output
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"encoder: {'orjson' if orjson is not None else 'json'}")
+    print(f"{'case':<24}{'rows':>10}{'current, s':>14}{'fast, s':>12}{'speedup':>10}")
+    for count in args.rows:
+        engine = create_users_table(count)
+        for name, current, fast in (("page (response_model)", page_current, page_fast), ("stream (/all)", stream_current, stream_fast)):
+            current_time, current_body = best_of(args.repeat, current, engine)
+            fast_time, fast_body = best_of(args.repeat, fast, engine)
+            fast_json = json.loads(fast_body)
+            assert json.loads(current_body) == fast_json, f"{name}: fast output differs from the current output"
+            check_items(fast_json["items"] if isinstance(fast_json, dict) else fast_json)
+            print(
+                f"{name:<24}{count:>10}{current_time:>14.4f}{fast_time:>12.4f}"
+                f"{current_time / fast_time:>9.1f}x"
+            )
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,187 @@
+import asyncio
+from collections import deque
+from itertools import islice
+from typing import Any, AsyncIterator, Iterable
+
+import httpx
+
+from config import Server
+from settings import ClientSettings, PaginationSettings
+from app.models.User import UserCreate, UserUpdate
+
+pagination_config = PaginationSettings()
+
+class AsyncUserApiClient:
+    """UserApiClient on httpx.AsyncClient, for tooling that fetches or changes many users at once.
+
+    At most `concurrency` requests are in flight; they share a keep-alive pool of the same size.
+    Use it as an async context manager, or call aclose() when done.
+    """
+
+    def __init__(self, env: str, concurrency: int = 16, **client_options: Any) -> None:
+        server = Server(env)
+        config = ClientSettings()
+        if server.in_process:
+            # Imported lazily: it loads app.main together with its database engine
+            from app.utils.asgi_transport import in_process_app
+
+            transport = httpx.ASGITransport(app=in_process_app.start().app)
+        else:
+            # httpx only retries failed connects; requests are not replayed once sent
+            transport = httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+                retries=config.retries,
+            )
+        self.client = httpx.AsyncClient(
+            base_url=server.base_url,
+            transport=transport,
+            timeout=httpx.Timeout(config.read_timeout, connect=config.connect_timeout),
+            follow_redirects=True,
+            **client_options,
+        )
+        self.concurrency = concurrency
+        self.limiter = asyncio.Semaphore(concurrency)
+
+    async def __aenter__(self) -> "AsyncUserApiClient":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    async def request(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        async with self.limiter:
+            return await self.client.request(method, path, **kwargs)
+
+    async def get_user(self, user_id: Any) -> httpx.Response:
+        return await self.request("GET", f"/api/users/{user_id}")
+
+    async def get_user_fields(self, user_id: Any, fields: str) -> httpx.Response:
+        return await self.request("GET", f"/api/users/{user_id}", params={"fields": fields})
+
+    async def get_user_if_none_match(self, user_id: Any, etag: str) -> httpx.Response:
+        return await self.request("GET", f"/api/users/{user_id}", headers={"If-None-Match": etag})
+
+    async def get_users(
+            self,
+            page: Any = pagination_config.default_page,
+            size: Any = pagination_config.default_size,
+            **filters: Any
+    ) -> httpx.Response:
+        return await self.request("GET", f"/api/users", params={"page": page, "size": size, **filters})
+
+    async def get_users_if_none_match(
+            self,
+            etag: str,
+            page: Any = pagination_config.default_page,
+            size: Any = pagination_config.default_size,
+            **filters: Any
+    ) -> httpx.Response:
+        return await self.request("GET", f"/api/users", params={"page": page, "size": size, **filters}, headers={"If-None-Match": etag})
+
+    async def search_users(
+            self,
+            q: Any,
+            page: Any = pagination_config.default_page,
+            size: Any = pagination_config.default_size
+    ) -> httpx.Response:
+        return await self.request("GET", f"/api/users/search", params={"q": q, "page": page, "size": size})
+
+    async def get_users_by_cursor(
+            self,
+            cursor: str | None = None,
+            size: Any = pagination_config.default_size
+    ) -> httpx.Response:
+        params = {"size": size}
+        if cursor is not None:
+            params["cursor"] = cursor
+        return await self.request("GET", f"/api/users/cursor", params=params)
+
+    async def iterate_users_by_cursor(self, size: int = pagination_config.default_size) -> AsyncIterator[dict]:
+        cursor = None
+        while True:
+            response = await self.get_users_by_cursor(cursor=cursor, size=size)
+            response.raise_for_status()
+            body = response.json()
+            for user in body["items"]:
+                yield user
+            cursor = body["next_page"]
+            if cursor is None:
+                return
+
+    async def get_all_users(self, fields: str | None = None) -> httpx.Response:
+        params = {"fields": fields} if fields is not None else None
+        return await self.request("GET", f"/api/users/all", params=params)
+
+    async def get_all_users_encoded(self, accept_encoding: str) -> httpx.Response:
+        return await self.request("GET", f"/api/users/all", headers={"Accept-Encoding": accept_encoding})
+
+    async def export_users(self, accept_encoding: str | None = None) -> httpx.Response:
+        headers = {"Accept-Encoding": accept_encoding} if accept_encoding is not None else None
+        return await self.request("GET", f"/api/users/export", headers=headers)
+
+    async def create_user_validated(self, user: UserCreate) -> httpx.Response:
+        return await self.request("POST", f"/api/users", json=user.model_dump(mode="json"))
+
+    async def create_user_raw(self, user: dict, method: str = "POST") -> httpx.Response:
+        return await self.request(method, f"/api/users", json=user)
+
+    async def create_users_bulk(self, users: list[UserCreate]) -> httpx.Response:
+        return await self.request("POST", f"/api/users/bulk", json=[user.model_dump(mode="json") for user in users])
+
+    async def create_users_bulk_raw(self, users: list[Any]) -> httpx.Response:
+        return await self.request("POST", f"/api/users/bulk", json=users)
+
+    async def update_user_validated(self, user_id: int, user: UserUpdate) -> httpx.Response:
+        return await self.request("PATCH", f"/api/users/{user_id}", json=user.model_dump(mode="json", exclude_none=True))
+
+    async def update_user_raw(self, user_id: Any, user: dict, method: str = "PATCH") -> httpx.Response:
+        return await self.request(method, f"/api/users/{user_id}", json=user)
+
+    async def update_users_bulk(self, user_ids: list[int], user: UserUpdate) -> httpx.Response:
+        payload = {"ids": user_ids, "changes": user.model_dump(mode="json", exclude_none=True)}
+        return await self.request("PATCH", f"/api/users/bulk", json=payload)
+
+    async def update_users_bulk_raw(self, payload: Any) -> httpx.Response:
+        return await self.request("PATCH", f"/api/users/bulk", json=payload)
+
+    async def delete_users_bulk(self, user_ids: list[Any]) -> httpx.Response:
+        return await self.request("DELETE", f"/api/users/bulk", json={"ids": user_ids})
+
+    async def delete_user(self, user_id: Any) -> httpx.Response:
+        return await self.request("DELETE", f"/api/users/{user_id}")
+
+    async def get_users_many(self, user_ids: Iterable[Any]) -> list[httpx.Response]:
+        # One request per id, at most `concurrency` at a time; responses come back in the order of user_ids
+        return list(await asyncio.gather(*(self.get_user(user_id) for user_id in user_ids)))
+
+    async def delete_users_many(self, user_ids: list[Any], chunk_size: int = 500) -> list[httpx.Response]:
+        chunks = [user_ids[start:start + chunk_size] for start in range(0, len(user_ids), chunk_size)]
+        return list(await asyncio.gather(*(self.delete_users_bulk(chunk) for chunk in chunks)))
+
+    async def iterate_all_pages(self, size: int = pagination_config.default_size, **filters: Any) -> AsyncIterator[dict]:
+        # The first page tells how many pages there are. The rest are fetched at most `concurrency` pages ahead of the one
+        # being yielded, and yielded in order; a slow consumer holds back new requests instead of buffering the table.
+        first = await self.get_users(page=1, size=size, **filters)
+        first.raise_for_status()
+        body = first.json()
+        for user in body["items"]:
+            yield user
+
+        remaining = iter(range(2, body["pages"] + 1))
+        def fetch(page: int) -> asyncio.Future:
+            return asyncio.ensure_future(self.get_users(page=page, size=size, **filters))
+
+        window = deque(fetch(page) for page in islice(remaining, self.concurrency))
+        try:
+            while window:
+                response = await window.popleft()
+                window.extend(fetch(page) for page in islice(remaining, 1))
+                response.raise_for_status()
+                for user in response.json()["items"]:
+                    yield user
+        finally:
+            for page in window:
+                page.cancel()
\ No newline at end of file
@@ -1,11 +1,39 @@
+from typing import Any
+
 from requests import Response
 
 from config import Server
+from app.models.ProfilingStatus import ProfilingStatus
 from app.utils.base_session import BaseSession
 
 class StatusApiClient:
-    def __init__(self, env: str) -> None:
-        self.session = BaseSession(base_url=Server(env).base_url)
+    def __init__(self, env: str, **session_options: Any) -> None:
+        server = Server(env)
+        self.session = BaseSession(base_url=server.base_url, in_process=server.in_process, **session_options)
 
     def get_status(self) -> Response:
-        return self.session.get(f"/status")
\ No newline at end of file
+        return self.session.get(f"/status")
+
+    def get_live(self) -> Response:
+        return self.session.get(f"/live")
+
+    def get_ready(self) -> Response:
+        return self.session.get(f"/ready")
+
+    def get_pool_status(self) -> Response:
+        return self.session.get(f"/status/pool")
+
+    def get_cache_status(self) -> Response:
+        return self.session.get(f"/status/cache")
+
+    def get_metrics(self) -> Response:
+        return self.session.get(f"/metrics")
+
+    def get_profiling(self) -> Response:
+        return self.session.get(f"/status/profiling")
+
+    def update_profiling(self, profiling: ProfilingStatus) -> Response:
+        return self.session.put(f"/status/profiling", json=profiling.model_dump())
+
+    def update_profiling_raw(self, payload: dict) -> Response:
+        return self.session.put(f"/status/profiling", json=payload)
\ No newline at end of file
@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Iterator
 
 from requests import Response
 
@@ -10,21 +10,75 @@ from app.models.User import UserCreate, UserUpdate
 pagination_config = PaginationSettings()
 
 class UserApiClient:
-    def __init__(self, env: str) -> None:
-        self.session = BaseSession(base_url=Server(env).base_url)
+    def __init__(self, env: str, **session_options: Any) -> None:
+        server = Server(env)
+        self.session = BaseSession(base_url=server.base_url, in_process=server.in_process, **session_options)
 
     def get_user(self, user_id: Any) -> Response:
         return self.session.get(f"/api/users/{user_id}")
 
+    def get_user_fields(self, user_id: Any, fields: str) -> Response:
+        return self.session.get(f"/api/users/{user_id}", params={"fields": fields})
+
+    def get_user_if_none_match(self, user_id: Any, etag: str) -> Response:
+        return self.session.get(f"/api/users/{user_id}", headers={"If-None-Match": etag})
+
     def get_users(
             self,
             page: Any = pagination_config.default_page,
+            size: Any = pagination_config.default_size,
+            **filters: Any
+    ) -> Response:
+        return self.session.get(f"/api/users", params={"page": page, "size": size, **filters})
+
+    def get_users_if_none_match(
+            self,
+            etag: str,
+            page: Any = pagination_config.default_page,
+            size: Any = pagination_config.default_size,
+            **filters: Any
+    ) -> Response:
+        return self.session.get(f"/api/users", params={"page": page, "size": size, **filters}, headers={"If-None-Match": etag})
+
+    def search_users(
+            self,
+            q: Any,
+            page: Any = pagination_config.default_page,
+            size: Any = pagination_config.default_size
+    ) -> Response:
+        return self.session.get(f"/api/users/search", params={"q": q, "page": page, "size": size})
+
+    def get_users_by_cursor(
+            self,
+            cursor: str | None = None,
             size: Any = pagination_config.default_size
     ) -> Response:
-        return self.session.get(f"/api/users", params={"page": page, "size": size})
+        params = {"size": size}
+        if cursor is not None:
+            params["cursor"] = cursor
+        return self.session.get(f"/api/users/cursor", params=params)
+
+    def iterate_users_by_cursor(self, size: int = pagination_config.default_size) -> Iterator[dict]:
+        cursor = None
+        while True:
+            response = self.get_users_by_cursor(cursor=cursor, size=size)
+            response.raise_for_status()
+            body = response.json()
+            yield from body["items"]
+            cursor = body["next_page"]
+            if cursor is None:
+                return
+
+    def get_all_users(self, fields: str | None = None) -> Response:
+        params = {"fields": fields} if fields is not None else None
+        return self.session.get(f"/api/users/all", params=params)
+
+    def get_all_users_encoded(self, accept_encoding: str, stream: bool = False) -> Response:
+        return self.session.get(f"/api/users/all", headers={"Accept-Encoding": accept_encoding}, stream=stream)
 
-    def get_all_users(self) -> Response:
-        return self.session.get(f"/api/users/all")
+    def export_users(self, accept_encoding: str | None = None) -> Response:
+        headers = {"Accept-Encoding": accept_encoding} if accept_encoding is not None else None
+        return self.session.get(f"/api/users/export", headers=headers, stream=True)
 
     def create_user_validated(self, user: UserCreate) -> Response:
        return self.session.post(f"/api/users", json=user.model_dump(mode="json"))
@@ -32,11 +86,27 @@ class UserApiClient:
     def create_user_raw(self, user: dict, method: str = "POST") -> Response:
         return self.session.request(method=method, path=f"/api/users", json=user)
 
+    def create_users_bulk(self, users: list[UserCreate]) -> Response:
+        return self.session.post(f"/api/users/bulk", json=[user.model_dump(mode="json") for user in users])
+
+    def create_users_bulk_raw(self, users: list[Any]) -> Response:
+        return self.session.post(f"/api/users/bulk", json=users)
+
     def update_user_validated(self, user_id: int, user: UserUpdate) -> Response:
         return self.session.patch(f"/api/users/{user_id}", json=user.model_dump(mode="json", exclude_none=True))
 
     def update_user_raw(self, user_id: Any, user:dict, method: str = "PATCH") -> Response:
         return self.session.request(method, path=f"/api/users/{user_id}", json=user)
 
+    def update_users_bulk(self, user_ids: list[int], user: UserUpdate) -> Response:
+        payload = {"ids": user_ids, "changes": user.model_dump(mode="json", exclude_none=True)}
+        return self.session.patch(f"/api/users/bulk", json=payload)
+
+    def update_users_bulk_raw(self, payload: Any) -> Response:
+        return self.session.patch(f"/api/users/bulk", json=payload)
+
+    def delete_users_bulk(self, user_ids: list[Any]) -> Response:
+        return self.session.delete(f"/api/users/bulk", json={"ids": user_ids})
+
     def delete_user(self, user_id: Any) -> Response:
         return self.session.delete(f"/api/users/{user_id}")
\ No newline at end of file
@@ -4,4 +4,7 @@ class Server:
             "dev": "http://0.0.0.0:8002",
             "beta": "",
             "rc": "http://0.0.0.0:8002",
-        }[env]
\ No newline at end of file
+            # app.main:app served from the test process itself, see app.utils.asgi_transport
+            "inproc": "http://testserver",
+        }[env]
+        self.in_process = env == "inproc"
\ No newline at end of file
@@ -4,4 +4,21 @@ class PaginationSettings(BaseSettings):
     default_page: int = 1
     default_size: int = 50
 
-    model_config = SettingsConfigDict(env_file=".env", extra="allow")
\ No newline at end of file
+    model_config = SettingsConfigDict(env_file=".env", extra="allow")
+
+class ClientSettings(BaseSettings):
+    # Keep-alive pool per host; raise pool_maxsize when one session is shared by many threads
+    pool_connections: int = 10
+    pool_maxsize: int = 10
+    connect_timeout: float = 3.05
+    read_timeout: float = 30
+    # Retries apply to idempotent methods (GET, HEAD, PUT, DELETE, OPTIONS, TRACE) and to failed connects
+    retries: int = 3
+    retry_backoff: float = 0.1
+    # 503 is left out: /ready answers it on purpose while the database is unavailable
+    retry_statuses: str = "502,504"
+
+    model_config = SettingsConfigDict(env_prefix="CLIENT_", env_file=".env", env_ignore_empty=True, extra="ignore")
+
+    def retry_status_list(self) -> list[int]:
+        return [int(status) for status in self.retry_statuses.split(",") if status.strip()]
\ No newline at end of file
@@ -0,0 +1,74 @@
+import asyncio
+import pytest
+from http import HTTPStatus
+from typing import Callable, Any
+
+from app.models.User import UserCreate
+from clients.async_user_client import AsyncUserApiClient
+from clients.user_client import UserApiClient
+
+@pytest.mark.parametrize("concurrency", [1, 8])
+def test_get_users_many_keeps_order(env: str, fill_test_data: list[int], concurrency: int):
+    user_ids = [*fill_test_data[:20], 10 ** 9]
+
+    async def fetch() -> list:
+        async with AsyncUserApiClient(env, concurrency=concurrency) as client:
+            return await client.get_users_many(user_ids)
+
+    responses = asyncio.run(fetch())
+    assert [response.status_code for response in responses] == [HTTPStatus.OK] * 20 + [HTTPStatus.NOT_FOUND]
+    assert [response.json()["id"] for response in responses[:-1]] == user_ids[:-1], "Expected responses in the order of the requested ids"
+
+@pytest.mark.usefixtures("fill_test_data")
+@pytest.mark.parametrize("size", [7, 50])
+def test_iterate_all_pages_covers_all_users(env: str, all_users: list, namespace_filter: dict, size: int):
+    async def collect() -> list:
+        async with AsyncUserApiClient(env, concurrency=4) as client:
+            return [user async for user in client.iterate_all_pages(size=size, **namespace_filter)]
+
+    users = asyncio.run(collect())
+    ids = [user["id"] for user in users]
+    assert ids == sorted(ids), "Expected users ordered by id across concurrently fetched pages"
+    assert set(ids) >= {user["id"] for user in all_users}, "Expected pages to cover all seeded users"
+    assert len(ids) == len(set(ids)), "Expected no user on more than one page"
+
+@pytest.mark.usefixtures("fill_test_data")
+@pytest.mark.parametrize("concurrency", [1, 3])
+def test_iterate_all_pages_prefetches_a_window(env: str, namespace_filter: dict, concurrency: int):
+    # A set: the client follows the redirect to /api/users/, so each page is requested twice
+    requested_pages = set()
+
+    async def record(request) -> None:
+        requested_pages.add(int(request.url.params["page"]))
+
+    async def consume_two_pages() -> int:
+        async with AsyncUserApiClient(env, concurrency=concurrency, event_hooks={"request": [record]}) as client:
+            pages = client.iterate_all_pages(size=1, **namespace_filter)
+            await anext(pages)
+            await anext(pages)
+            # A slow consumer: nothing more is requested however long it waits
+            await asyncio.sleep(0.2)
+            requested = len(requested_pages)
+            await pages.aclose()
+            return requested
+
+    requested = asyncio.run(consume_two_pages())
+    assert requested == 2 + concurrency, f"Expected the first page and a window of {concurrency} after page 2, but got requests for {sorted(requested_pages)}"
+
+@pytest.mark.parametrize("concurrency", [1, 8])
+def test_delete_users_many(env: str, user_client: UserApiClient, user_payload_factory: Callable[[], dict[str, Any]], concurrency: int):
+    # Concurrent bulk DELETEs run in separate transactions, in process (--env inproc) as well as against a served app
+    response = user_client.create_users_bulk(users=[UserCreate(**user_payload_factory()) for _ in range(11)])
+    assert response.status_code == HTTPStatus.CREATED, f"ERROR {response.status_code} {response.text}"
+    user_ids = [user["id"] for user in response.json()["created"]]
+
+    async def delete() -> list:
+        async with AsyncUserApiClient(env, concurrency=concurrency) as client:
+            return await client.delete_users_many(user_ids, chunk_size=2)
+
+    responses = asyncio.run(delete())
+    assert [response.status_code for response in responses] == [HTTPStatus.OK] * 6
+    deleted_ids = sorted(user_id for response in responses for user_id in response.json()["ids"])
+    assert deleted_ids == sorted(user_ids), f"Expected deleted ids {sorted(user_ids)}, but got {deleted_ids}"
+    for user_id in user_ids:
+        assert user_client.get_user(user_id).status_code == HTTPStatus.NOT_FOUND
\ No newline at end of file
@@ -0,0 +1,58 @@
+import json
+import pytest
+from typing import Callable
+from http import HTTPStatus
+
+from clients.user_client import UserApiClient
+
+@pytest.mark.usefixtures("fill_test_data")
+@pytest.mark.parametrize("accept_encoding, expected_encoding", [
+    ("gzip", "gzip"),
+    ("br", "br"),
+    ("zstd", "zstd"),
+    ("gzip, br;q=0.5", "gzip"),
+    ("gzip, br, zstd", "zstd"),
+    ("*", "zstd"),
+])
+def test_all_users_compressed(user_client: UserApiClient, all_users: list, in_namespace: Callable, accept_encoding: str, expected_encoding: str):
+    response = user_client.get_all_users_encoded(accept_encoding)
+    assert response.status_code == HTTPStatus.OK, f"ERROR {response.status_code} {response.text}"
+
+    assert response.headers.get("Content-Encoding") == expected_encoding, f"Expected Content-Encoding {expected_encoding}, but got {response.headers.get('Content-Encoding')}"
+    assert "Accept-Encoding" in response.headers.get("Vary", ""), "Expected Vary: Accept-Encoding"
+    assert in_namespace(response.json()) == all_users, "Expected decompressed body to match the uncompressed one"
+
+@pytest.mark.usefixtures("fill_test_data")
+@pytest.mark.parametrize("accept_encoding", ["identity", "gzip;q=0", "compress"])
+def test_all_users_not_compressed(user_client: UserApiClient, all_users: list, in_namespace: Callable, accept_encoding: str):
+    response = user_client.get_all_users_encoded(accept_encoding)
+    assert response.status_code == HTTPStatus.OK, f"ERROR {response.status_code} {response.text}"
+
+    assert "Content-Encoding" not in response.headers, f"Expected identity response, but got {response.headers.get('Content-Encoding')}"
+    assert in_namespace(response.json()) == all_users
+
+@pytest.mark.usefixtures("fill_test_data")
+def test_compressed_response_is_smaller(user_client: UserApiClient):
+    plain = user_client.get_all_users_encoded("identity")
+    compressed = user_client.get_all_users_encoded("gzip", stream=True)
+
+    compressed_size = len(compressed.raw.read(decode_content=False))
+    assert compressed_size < len(plain.content) / 2, f"Expected at least 2x compression, but got {len(plain.content)} -> {compressed_size}"
+
+def test_small_response_not_compressed(user_client: UserApiClient, created_user: dict, created_user_cleanup: list[int]):
+    created_user_cleanup.append(created_user["id"])
+    response = user_client.get_user(created_user["id"])
+    assert response.status_code == HTTPStatus.OK, f"ERROR {response.status_code} {response.text}"
+
+    assert "Content-Encoding" not in response.headers, "Expected responses below the size threshold to stay uncompressed"
+
+@pytest.mark.usefixtures("fill_test_data")
+@pytest.mark.parametrize("accept_encoding", ["gzip", "br", "zstd"])
+def test_export_users_streamed_compressed(user_client: UserApiClient, all_users: list, in_namespace: Callable, accept_encoding: str):
+    response = user_client.export_users(accept_encoding)
+    assert response.status_code == HTTPStatus.OK, f"ERROR {response.status_code} {response.text}"
+
+    assert response.headers.get("Content-Encoding") == accept_encoding
+    assert "Content-Length" not in response.headers, "Expected a streamed (chunked) response"
+    exported_users = [json.loads(line) for line in response.iter_lines() if line]
+    assert in_namespace(exported_users) == all_users, "Expected decompressed stream to match all users"
\ No newline at end of file
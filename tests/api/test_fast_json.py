@@ -0,0 +1,66 @@
+import json
+import pytest
+from http import HTTPStatus
+from typing import Callable
+
+from jsonschema import validate
+
+from clients.user_client import UserApiClient
+from schemas.single_user_schema import single_user
+
+@pytest.fixture
+def fast_json(env: str, monkeypatch) -> Callable[[bool], None]:
+    # RESPONSE_FAST_JSON is read per request, so the in-process app can switch it; a served app keeps its own setting
+    if env != "inproc":
+        pytest.skip("Switching RESPONSE_FAST_JSON needs the in-process app (--env inproc)")
+    from app.routers.users import response_config
+
+    def _set(enabled: bool) -> None:
+        monkeypatch.setattr(response_config, "fast_json", enabled)
+    return _set
+
+@pytest.fixture
+def plain_client(env: str) -> UserApiClient:
+    # Without the ETag cache, so the second request is answered by the app instead of a 304
+    return UserApiClient(env, etag_cache=False)
+
+def check_user_keys(users: list[dict]) -> None:
+    for user in users:
+        validate(instance=user, schema=single_user)
+        assert list(user) == list(single_user["properties"]), f"Expected keys in schema order, but got {list(user)}"
+
+@pytest.mark.usefixtures("fill_test_data")
+def test_fast_json_page_matches_default(plain_client: UserApiClient, fast_json: Callable[[bool], None], namespace_filter: dict):
+    fast_json(False)
+    default = plain_client.get_users(page=1, size=10, **namespace_filter)
+    fast_json(True)
+    fast = plain_client.get_users(page=1, size=10, **namespace_filter)
+
+    assert default.status_code == fast.status_code == HTTPStatus.OK, f"ERROR {default.status_code} {fast.status_code}"
+    assert fast.json() == default.json(), "Expected the fast page to match the default page"
+    assert fast.headers["ETag"] == default.headers["ETag"], "Expected the same ETag for the same page"
+    check_user_keys(fast.json()["items"])
+
+@pytest.mark.usefixtures("fill_test_data")
+def test_fast_json_all_users_matches_default(plain_client: UserApiClient, fast_json: Callable[[bool], None]):
+    fast_json(False)
+    default = plain_client.get_all_users()
+    fast_json(True)
+    fast = plain_client.get_all_users()
+
+    assert default.status_code == fast.status_code == HTTPStatus.OK, f"ERROR {default.status_code} {fast.status_code}"
+    assert fast.json() == default.json(), "Expected /all to return the same users with fast JSON"
+    check_user_keys(fast.json())
+
+@pytest.mark.usefixtures("fill_test_data")
+def test_fast_json_export_matches_default(plain_client: UserApiClient, fast_json: Callable[[bool], None]):
+    fast_json(False)
+    default = plain_client.export_users()
+    fast_json(True)
+    fast = plain_client.export_users()
+
+    assert default.status_code == fast.status_code == HTTPStatus.OK, f"ERROR {default.status_code} {fast.status_code}"
+    default_users = [json.loads(line) for line in default.iter_lines() if line]
+    fast_users = [json.loads(line) for line in fast.iter_lines() if line]
+    assert fast_users == default_users, "Expected /export to return the same users with fast JSON"
+    check_user_keys(fast_users)
\ No newline at end of file
@@ -0,0 +1,46 @@
+import asyncio
+import json
+import pytest
+from http import HTTPStatus
+from typing import Generator
+
+from sqlalchemy import Engine, create_engine, insert
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, SQLModel
+
+from app.database.constraints import EMAIL_INDEX, is_unique_violation
+from app.models.User import User
+from app.utils.exception_handlers import integrity_error_handler
+
+@pytest.fixture
+def user_engine(tmp_path) -> Generator[Engine, None, None]:
+    engine = create_engine(f"sqlite:///{tmp_path / 'users.db'}")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(User(email="george.bluth@reqres.in", first_name="George", last_name="Bluth", avatar="https://reqres.in/img/faces/1-image.jpg"))
+        session.commit()
+    yield engine
+    engine.dispose()
+
+def insert_error(engine: Engine, **values) -> IntegrityError:
+    user = {"email": "janet.weaver@reqres.in", "first_name": "Janet", "last_name": "Weaver", "avatar": "https://reqres.in/img/faces/2-image.jpg", **values}
+    with pytest.raises(IntegrityError) as error:
+        with engine.begin() as connection:
+            connection.execute(insert(User).values(**user))
+    return error.value
+
+def test_duplicate_email_is_conflict(user_engine: Engine):
+    error = insert_error(user_engine, email="george.bluth@reqres.in")
+    assert is_unique_violation(error, EMAIL_INDEX), f"Expected a unique violation on {EMAIL_INDEX.name}, but got {error.orig}"
+
+    response = asyncio.run(integrity_error_handler(None, error))
+    assert response.status_code == HTTPStatus.CONFLICT, f"Expected 409, but got {response.status_code}"
+    assert json.loads(response.body) == {"message": "User with this email already exists"}
+
+def test_not_null_violation_is_not_conflict(user_engine: Engine):
+    error = insert_error(user_engine, first_name=None)
+    assert not is_unique_violation(error, EMAIL_INDEX), f"Expected a NOT NULL violation not to count as a duplicate email: {error.orig}"
+
+    response = asyncio.run(integrity_error_handler(None, error))
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY, f"Expected 422, but got {response.status_code}"
+    assert "email" not in json.loads(response.body)["message"], f"Expected no duplicate email message, but got {response.body}"
\ No newline at end of file
@@ -0,0 +1,41 @@
+import pytest
+from http import HTTPStatus
+from typing import Callable
+
+from clients.status_client import StatusApiClient
+from clients.user_client import UserApiClient
+
+def test_metrics_content_type(status_client: StatusApiClient):
+    response = status_client.get_metrics()
+    assert response.status_code == HTTPStatus.OK, f"ERROR {response.status_code} {response.text}"
+    assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4"), f"Expected Prometheus text format, but got {response.headers['Content-Type']}"
+
+@pytest.mark.parametrize("family", [
+    "http_requests_total", "http_request_duration_seconds", "http_requests_in_flight", "db_statement_duration_seconds",
+    "db_pool_size", "db_pool_checked_out", "db_pool_wait_seconds", "cache_hits_total", "cache_misses_total", "cache_hit_ratio",
+])
+def test_metrics_families(status_client: StatusApiClient, family: str):
+    response = status_client.get_metrics()
+    assert f"# TYPE {family} " in response.text, f"Expected metric family {family}"
+
+def test_metrics_count_requests_per_route(user_client: UserApiClient, scrape_metrics: Callable[[], dict[str, float]]):
+    route_labels = '{method="GET",route="/api/users/{user_id}",status="404"}'
+    before = scrape_metrics().get(f"http_requests_total{route_labels}", 0)
+
+    assert user_client.get_user(10 ** 9).status_code == HTTPStatus.NOT_FOUND
+    samples = scrape_metrics()
+
+    assert samples[f"http_requests_total{route_labels}"] == before + 1, "Expected the request to be counted under its route template"
+    assert samples[f"http_request_duration_seconds_count{route_labels}"] == before + 1
+    assert samples[f'http_request_duration_seconds_bucket{route_labels[:-1]},le="+Inf"}}'] == before + 1
+
+@pytest.mark.usefixtures("fill_test_data")
+def test_metrics_record_sql_statements(user_client: UserApiClient, scrape_metrics: Callable[[], dict[str, float]]):
+    def select_count(samples: dict[str, float]) -> float:
+        return sum(value for name, value in samples.items() if name.startswith("db_statement_duration_seconds_count") and 'operation="SELECT"' in name)
+
+    before = select_count(scrape_metrics())
+    assert user_client.get_users().status_code == HTTPStatus.OK
+    after = select_count(scrape_metrics())
+
+    assert after > before, "Expected SELECT statements to be timed"
\ No newline at end of file
@@ -0,0 +1,64 @@
+import re
+from typing import Generator
+
+import pytest
+from http import HTTPStatus
+
+from app.models.ProfilingStatus import ProfilingStatus
+from clients.status_client import StatusApiClient
+from clients.user_client import UserApiClient
+
+@pytest.fixture
+def profiling(status_client: StatusApiClient) -> Generator[ProfilingStatus, None, None]:
+    response = status_client.get_profiling()
+    assert response.status_code == HTTPStatus.OK, f"ERROR {response.status_code} {response.text}"
+    initial = ProfilingStatus(**response.json())
+
+    yield initial
+
+    status_client.update_profiling(initial)
+
+def test_profiling_switch(status_client: StatusApiClient, profiling: ProfilingStatus):
+    enabled = profiling.model_copy(update={"enabled": True, "slow_request_ms": 250})
+    response = status_client.update_profiling(enabled)
+    assert response.status_code == HTTPStatus.OK, f"ERROR {response.status_code} {response.text}"
+    assert ProfilingStatus(**response.json()) == enabled
+
+    current = ProfilingStatus(**status_client.get_profiling().json())
+    assert current == enabled, f"Expected {enabled}, but got {current}"
+
+@pytest.mark.usefixtures("fill_test_data")
+def test_profiling_server_timing(status_client: StatusApiClient, user_client: UserApiClient, profiling: ProfilingStatus):
+    status_client.update_profiling(profiling.model_copy(update={"enabled": True, "server_timing": True}))
+
+    response = user_client.search_users(q="reqres")
+    assert response.status_code == HTTPStatus.OK, f"ERROR {response.status_code} {response.text}"
+    server_timing = response.headers.get("Server-Timing", "")
+
+    statements = re.search(r'sql;dur=[\d.]+;desc="(\d+) statements"', server_timing)
+    assert statements, f"Expected SQL timing in Server-Timing, but got {server_timing!r}"
+    assert int(statements.group(1)) >= 2, "Expected the search and count queries to be recorded"
+    for metric in ('orm;desc="', "serialize;dur=", "total;dur="):
+        assert metric in server_timing, f"Expected {metric} in Server-Timing, but got {server_timing!r}"
+
+def test_profiling_disabled_has_no_server_timing(status_client: StatusApiClient, user_client: UserApiClient, profiling: ProfilingStatus):
+    status_client.update_profiling(profiling.model_copy(update={"enabled": False, "server_timing": True}))
+
+    response = user_client.search_users(q="reqres")
+    assert response.status_code == HTTPStatus.OK, f"ERROR {response.status_code} {response.text}"
+    assert "Server-Timing" not in response.headers, "Expected no Server-Timing header while profiling is off"
+
+@pytest.mark.parametrize("payload", [{"enabled": True}, {"enabled": True, "slow_request_ms": -1, "slow_query_ms": 0, "server_timing": False}])
+def test_profiling_invalid_update(status_client: StatusApiClient, profiling: ProfilingStatus, payload: dict):
+    response = status_client.update_profiling_raw(payload)
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY, f"ERROR {response.status_code} {response.text}"
+@pytest.mark.usefixtures("fill_test_data")
+def test_profiling_counts_loaded_users(status_client: StatusApiClient, user_client: UserApiClient, profiling: ProfilingStatus, namespace_filter: dict):
+    status_client.update_profiling(profiling.model_copy(update={"enabled": True, "server_timing": True}))
+
+    response = user_client.get_users(page=1, size=5, **namespace_filter)
+    assert response.status_code == HTTPStatus.OK, f"ERROR {response.status_code} {response.text}"
+    server_timing = response.headers.get("Server-Timing", "")
+
+    items = len(response.json()["items"])
+    assert f'orm;desc="{items} objects"' in server_timing, f"Expected {items} loaded users in Server-Timing, but got {server_timing!r}"
\ No newline at end of file
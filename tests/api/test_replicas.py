@@ -0,0 +1,148 @@
+import asyncio
+import pytest
+from http import HTTPStatus
+from typing import Callable, Generator
+
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, SQLModel
+
+from app.database.replicas import ReplicaSet
+from app.database.user_cache import UserCache
+from app.models.User import User
+from app.utils.cache import MemoryCache
+from clients.status_client import StatusApiClient
+from clients.user_client import UserApiClient
+from app.models.User import UserCreate
+
+@pytest.fixture
+def replica_engines(tmp_path) -> Generator[list[Engine], None, None]:
+    # Two SQLite files: the second lives in a directory that does not exist, so it cannot be opened
+    engines = [
+        create_engine(f"sqlite:///{tmp_path / 'replica-0.db'}"),
+        create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica-1.db'}"),
+    ]
+    yield engines
+    for replica in engines:
+        replica.dispose()
+
+def test_replica_set_round_robin(tmp_path):
+    engines = [create_engine(f"sqlite:///{tmp_path / f'replica-{index}.db'}") for index in range(3)]
+    replicas = ReplicaSet(["replica-0", "replica-1", "replica-2"], engines)
+
+    chosen = [replicas.choose() for _ in range(6)]
+    assert chosen == engines * 2, f"Expected each replica in turn, but got {[engines.index(replica) for replica in chosen]}"
+
+def test_replica_set_refresh_marks_unreachable_replica(replica_engines: list[Engine]):
+    replicas = ReplicaSet(["replica-0", "replica-1"], replica_engines)
+
+    assert asyncio.run(replicas.refresh(timeout_seconds=5)) == [True, False], f"Expected only replica-1 to fail its check, but got {replicas.healthy}"
+    assert {replicas.choose() for _ in range(4)} == {replica_engines[0]}, "Expected the unreachable replica to be skipped"
+
+def test_replica_set_connect_failure_marks_replica_unhealthy(replica_engines: list[Engine]):
+    replicas = ReplicaSet(["replica-0", "replica-1"], replica_engines)
+    with pytest.raises(OperationalError):
+        replica_engines[1].connect()
+
+    assert replicas.healthy == [True, False], f"Expected a failed connect to take replica-1 out, but got {replicas.healthy}"
+
+def test_replica_set_recovers_after_successful_check(tmp_path, replica_engines: list[Engine]):
+    replicas = ReplicaSet(["replica-1"], replica_engines[1:])
+    asyncio.run(replicas.refresh(timeout_seconds=5))
+    assert replicas.choose() is None, "Expected no replica while the only one is down"
+
+    (tmp_path / "missing").mkdir()
+    asyncio.run(replicas.refresh(timeout_seconds=5))
+    assert replicas.choose() is replica_engines[1], "Expected the replica back after a successful check"
+
+def test_read_engine_falls_back_to_primary(env: str, replica_engines: list[Engine], monkeypatch):
+    if env != "inproc":
+        pytest.skip("Replacing the app's replicas needs the in-process app (--env inproc)")
+    from app.database import engine as database
+
+    replicas = ReplicaSet(["replica-1"], replica_engines[1:])
+    monkeypatch.setattr(database, "replica_set", replicas)
+    assert database.read_engine() is replica_engines[1], "Expected reads on the replica before its check"
+
+    asyncio.run(replicas.refresh(timeout_seconds=5))
+    assert database.read_engine() is database.engine, "Expected reads on the primary once no replica is healthy"
+
+@pytest.fixture
+def replicas(scrape_metrics: Callable[[], dict[str, float]]) -> list[str]:
+    # Names of the healthy replicas; the tests only apply to an app started with DATABASE_REPLICAS or DATABASE_ASYNC_REPLICAS
+    prefix = 'db_replica_healthy{engine="'
+    names = [name[len(prefix):-2] for name, value in scrape_metrics().items() if name.startswith(prefix) and value == 1]
+    if not names:
+        pytest.skip("The app has no healthy read replicas")
+    return names
+
+def statement_count(samples: dict[str, float], engines: list[str], operation: str) -> float:
+    return sum(samples.get(f'db_statement_duration_seconds_count{{engine="{engine}",operation="{operation}"}}', 0) for engine in engines)
+
+def test_pool_status_lists_replicas(status_client: StatusApiClient, replicas: list[str]):
+    response = status_client.get_pool_status()
+    assert response.status_code == HTTPStatus.OK, f"ERROR {response.status_code} {response.text}"
+    assert set(replicas) <= set(response.json()["replicas"]), f"Expected pool stats for {replicas}, but got {response.json()['replicas']}"
+
+@pytest.mark.usefixtures("fill_test_data")
+def test_reads_go_to_replicas(user_client: UserApiClient, replicas: list[str], scrape_metrics: Callable[[], dict[str, float]]):
+    before = statement_count(scrape_metrics(), replicas, "SELECT")
+    assert user_client.get_users().status_code == HTTPStatus.OK
+    after = statement_count(scrape_metrics(), replicas, "SELECT")
+
+    assert after > before, f"Expected GET /api/users to query a replica, but replica SELECTs stayed at {before}"
+
+def test_writes_go_to_primary(
+        status_client: StatusApiClient,
+        user_client: UserApiClient,
+        replicas: list[str],
+        scrape_metrics: Callable[[], dict[str, float]],
+        user_payload_factory: Callable[[], dict],
+        created_user_cleanup: list[int]
+):
+    primary = ["async_engine" if status_client.get_pool_status().json()["async_engine"] is not None else "engine"]
+    before = scrape_metrics()
+    response = user_client.create_user_validated(user=UserCreate(**user_payload_factory()))
+    assert response.status_code == HTTPStatus.CREATED, f"ERROR {response.status_code} {response.text}"
+    created_user_cleanup.append(response.json()["id"])
+    after = scrape_metrics()
+
+    assert statement_count(after, primary, "INSERT") > statement_count(before, primary, "INSERT"), "Expected the INSERT to run on the primary"
+    assert statement_count(after, replicas, "INSERT") == 0, "Expected no INSERT on a replica"
+
+@pytest.fixture
+def stale_replica(env: str, tmp_path, monkeypatch) -> Engine:
+    # A second database standing in for a replica that has not caught up with the primary yet
+    if env != "inproc":
+        pytest.skip("Reading through a replica engine needs the in-process app (--env inproc)")
+    from app.database import async_users
+
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    SQLModel.metadata.create_all(replica)
+    monkeypatch.setattr(async_users, "is_replica", lambda bind: bind is replica)
+    yield replica
+    replica.dispose()
+
+def test_user_cache_filled_from_primary_not_replica(
+        user_client: UserApiClient,
+        stale_replica: Engine,
+        created_user: dict,
+        created_user_cleanup: list[int],
+        monkeypatch
+):
+    from app.database import async_users
+    from app.utils.asgi_transport import in_process_app
+
+    user_id = created_user["id"]
+    created_user_cleanup.append(user_id)
+    with Session(stale_replica) as session:
+        session.add(User(**{**created_user, "last_name": "Stale"}))
+        session.commit()
+    cache = UserCache(MemoryCache(max_entries=10, ttl_seconds=60), name="memory")
+    monkeypatch.setattr(async_users, "user_cache", cache)
+
+    with Session(stale_replica) as session:
+        user = in_process_app.client.portal.call(async_users.get_user, session, user_id)
+
+    assert user.last_name == created_user["last_name"], f"Expected the primary's row, but got last_name {user.last_name}"
+    assert cache.get(user_id).last_name == created_user["last_name"], "Expected the cache to hold the primary's row"
\ No newline at end of file
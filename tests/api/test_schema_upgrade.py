@@ -0,0 +1,71 @@
+import pytest
+from typing import Generator
+from sqlalchemy import Engine, Index, create_engine, inspect, text
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session
+
+from app.database.migrations import upgrade_user_table
+from app.models.User import User
+
+# The user table as the first release created it
+BASELINE_USER_TABLE = (
+    'CREATE TABLE "user" (id INTEGER NOT NULL PRIMARY KEY, email VARCHAR NOT NULL, first_name VARCHAR NOT NULL, '
+    'last_name VARCHAR NOT NULL, avatar VARCHAR NOT NULL)'
+)
+
+def insert_baseline_user(engine: Engine, email: str = "george.bluth@reqres.in") -> None:
+    with engine.begin() as connection:
+        connection.execute(
+            text('INSERT INTO "user" (email, first_name, last_name, avatar) VALUES (:email, \'George\', \'Bluth\', \'https://reqres.in/img/faces/1-image.jpg\')'),
+            {"email": email},
+        )
+
+@pytest.fixture
+def baseline_engine(tmp_path) -> Generator[Engine, None, None]:
+    engine = create_engine(f"sqlite:///{tmp_path / 'baseline.db'}")
+    with engine.begin() as connection:
+        connection.execute(text(BASELINE_USER_TABLE))
+    insert_baseline_user(engine)
+    yield engine
+    engine.dispose()
+
+def test_upgrade_adds_version_column(baseline_engine: Engine):
+    for _ in range(2):
+        with baseline_engine.begin() as connection:
+            upgrade_user_table(connection)
+
+    columns = {column["name"] for column in inspect(baseline_engine).get_columns("user")}
+    assert "version" in columns, f"Expected the version column, but got {sorted(columns)}"
+    with Session(baseline_engine) as session:
+        user = session.get(User, 1)
+    assert user is not None and user.version == 1, f"Expected the existing user at version 1, but got {user!r}"
+
+def test_upgrade_creates_indexes(baseline_engine: Engine):
+    with baseline_engine.begin() as connection:
+        upgrade_user_table(connection)
+
+    indexes = {index["name"]: bool(index["unique"]) for index in inspect(baseline_engine).get_indexes("user")}
+    expected = {"ix_user_email": True, "ix_user_first_name": False, "ix_user_last_name": False}
+    assert indexes == expected, f"Expected {expected} (PostgreSQL-only indexes skipped on SQLite), but got {indexes}"
+    with pytest.raises(IntegrityError):
+        insert_baseline_user(baseline_engine)
+
+def test_upgrade_reports_duplicate_emails(baseline_engine: Engine):
+    insert_baseline_user(baseline_engine)
+
+    with pytest.raises(RuntimeError, match="ix_user_email"):
+        with baseline_engine.begin() as connection:
+            upgrade_user_table(connection)
+
+def test_upgrade_tolerates_concurrent_index_creation(baseline_engine: Engine, monkeypatch):
+    with baseline_engine.begin() as connection:
+        upgrade_user_table(connection)
+    # Another instance created the indexes after this one checked for them
+    create = Index.create
+    monkeypatch.setattr(Index, "create", lambda index, bind, checkfirst=False: create(index, bind, checkfirst=False))
+
+    with baseline_engine.begin() as connection:
+        upgrade_user_table(connection)
+
+    with pytest.raises(IntegrityError):
+        insert_baseline_user(baseline_engine)
\ No newline at end of file
@@ -1,6 +1,9 @@
+import os
+import pytest
 from http import HTTPStatus
 
-from app.models.AppStatus import AppStatus
+from app.models.AppStatus import AppStatus, LiveStatus
+from app.models.PoolStatus import PoolStatus
 from clients.status_client import StatusApiClient
 
 def test_status_database_available(status_client: StatusApiClient):
@@ -25,4 +28,45 @@ def test_status_response_headers(status_client: StatusApiClient):
 def test_status_response_time(status_client: StatusApiClient):
     response = status_client.get_status()
     assert response.status_code == HTTPStatus.OK, f"ERROR {response.status_code} {response.text}"
-    assert response.elapsed.total_seconds() < 1.0
\ No newline at end of file
+    assert response.elapsed.total_seconds() < 1.0
+
+def test_pool_status_structure(status_client: StatusApiClient):
+    status_client.get_status()
+    response = status_client.get_pool_status()
+    assert response.status_code == HTTPStatus.OK, f"ERROR {response.status_code} {response.text}"
+    pool_status = PoolStatus(**response.json())
+
+    assert pool_status.engine.size > 0, f"Expected positive pool size, but got {pool_status.engine.size}"
+    assert pool_status.engine.checked_out >= 0
+    wait_seconds = pool_status.async_engine.wait_seconds if pool_status.async_engine else pool_status.engine.wait_seconds
+    assert wait_seconds.count > 0, "Expected pool checkouts to be recorded"
+    assert wait_seconds.buckets["+Inf"] == wait_seconds.count
+
+def test_live(status_client: StatusApiClient):
+    response = status_client.get_live()
+    assert response.status_code == HTTPStatus.OK, f"ERROR {response.status_code} {response.text}"
+    assert LiveStatus(**response.json()).alive is True
+
+def test_ready(status_client: StatusApiClient):
+    response = status_client.get_ready()
+    assert response.status_code == HTTPStatus.OK, f"ERROR {response.status_code} {response.text}"
+    ready_status = AppStatus(**response.json())
+
+    assert ready_status.database is True, "'database' is not True"
+    assert ready_status.database_checked_at is not None, "Expected the time of the last database probe"
+    assert 0 <= ready_status.pool_saturation <= 1, f"Expected pool saturation within [0, 1], but got {ready_status.pool_saturation}"
+
+@pytest.mark.skipif(os.getenv("PYTEST_XDIST_WORKER") is not None, reason="Pool checkouts are server-wide, other workers' requests add to them")
+def test_status_uses_cached_probe(status_client: StatusApiClient):
+    def checkouts() -> int:
+        pool_status = PoolStatus(**status_client.get_pool_status().json())
+        engines = [pool_status.engine, pool_status.async_engine]
+        return sum(stats.wait_seconds.count for stats in engines if stats is not None)
+
+    before = checkouts()
+    for _ in range(5):
+        assert status_client.get_status().status_code == HTTPStatus.OK
+    after = checkouts()
+
+    # the background probe may run once in between, but /status itself must not touch the pool
+    assert after - before <= 1, f"Expected /status not to check out connections, but got {after - before} checkouts"
\ No newline at end of file
@@ -0,0 +1,180 @@
+import asyncio
+import threading
+import pytest
+from http import HTTPStatus
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+
+from app.database import user_cache as user_cache_module
+from app.database.user_cache import UserCache, invalidate_users, invalidate_users_async
+from app.models.CacheStatus import CacheStatus
+from app.models.User import User, UserUpdate
+from app.utils.cache import MemoryCache
+from clients.status_client import StatusApiClient
+from clients.user_client import UserApiClient
+
+@pytest.fixture
+def cache_status(status_client: StatusApiClient) -> CacheStatus:
+    response = status_client.get_cache_status()
+    assert response.status_code == HTTPStatus.OK, f"ERROR {response.status_code} {response.text}"
+    return CacheStatus(**response.json())
+
+@pytest.fixture
+def cache_enabled(cache_status: CacheStatus) -> None:
+    if cache_status.backend == "none":
+        pytest.skip("User cache is disabled on the server")
+
+@pytest.mark.usefixtures("cache_enabled")
+def test_user_cache_hits_on_repeated_get(user_client: UserApiClient, status_client: StatusApiClient, created_user: dict, created_user_cleanup: list[int]):
+    user_id = created_user["id"]
+    created_user_cleanup.append(user_id)
+
+    first = user_client.get_user(user_id)
+    before = CacheStatus(**status_client.get_cache_status().json())
+    second = user_client.get_user(user_id)
+    after = CacheStatus(**status_client.get_cache_status().json())
+
+    assert first.json() == second.json(), "Expected cached user to match the stored user"
+    assert after.hits > before.hits, f"Expected a cache hit, but hits went from {before.hits} to {after.hits}"
+
+@pytest.mark.usefixtures("cache_enabled")
+def test_user_cache_invalidated_on_update(user_client: UserApiClient, created_user: dict, created_user_cleanup: list[int]):
+    user_id = created_user["id"]
+    created_user_cleanup.append(user_id)
+    user_client.get_user(user_id)
+
+    user_client.update_user_validated(user_id=user_id, user=UserUpdate(last_name="Cacheinvalidated"))
+    response = user_client.get_user(user_id)
+
+    assert response.json()["last_name"] == "Cacheinvalidated", f"Expected updated last_name, but got {response.json()['last_name']}"
+
+@pytest.mark.usefixtures("cache_enabled")
+def test_user_cache_invalidated_on_bulk_delete(user_client: UserApiClient, created_user: dict):
+    user_id = created_user["id"]
+    user_client.get_user(user_id)
+
+    user_client.delete_users_bulk([user_id])
+    response = user_client.get_user(user_id)
+
+    assert response.status_code == HTTPStatus.NOT_FOUND, f"ERROR {response.status_code} {response.text}"
+
+def test_cache_status_structure(cache_status: CacheStatus):
+    assert cache_status.backend in ("none", "memory", "redis")
+    assert cache_status.hits >= 0 and cache_status.misses >= 0
+
+
+class FakeBackend:
+    def __init__(self, blocking: bool = False):
+        self.blocking = blocking
+        self.entries: dict[str, bytes] = {}
+        self.threads: set[threading.Thread] = set()
+
+    def get(self, key: str) -> bytes | None:
+        self.threads.add(threading.current_thread())
+        return self.entries.get(key)
+
+    def set(self, key: str, value: bytes) -> None:
+        self.threads.add(threading.current_thread())
+        self.entries[key] = value
+
+    def delete(self, keys) -> None:
+        self.threads.add(threading.current_thread())
+        for key in keys:
+            self.entries.pop(key, None)
+
+@pytest.fixture
+def fake_user_cache(monkeypatch) -> UserCache:
+    # Replaces the app's cache, which the commit hooks invalidate
+    cache = UserCache(FakeBackend(), name="fake")
+    monkeypatch.setattr(user_cache_module, "user_cache", cache)
+    return cache
+
+def make_user(user_id: int = 1, version: int = 1) -> User:
+    return User(
+        id=user_id, email="george.bluth@reqres.in", first_name="George", last_name="Bluth",
+        avatar="https://reqres.in/img/faces/1-image.jpg", version=version
+    )
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+    cache.get("a")
+    cache.set("c", b"3")
+
+    assert len(cache) == 2, f"Expected 2 entries, but got {len(cache)}"
+    assert cache.get("b") is None, "Expected the least recently used entry to be evicted"
+    assert cache.get("a") == b"1" and cache.get("c") == b"3"
+
+def test_memory_cache_expires_entries(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr("app.utils.cache.time", SimpleNamespace(monotonic=lambda: clock[0]))
+    cache = MemoryCache(max_entries=10, ttl_seconds=5)
+    cache.set("a", b"1")
+
+    clock[0] = 104.9
+    assert cache.get("a") == b"1", "Expected the entry within its TTL"
+    clock[0] = 105.1
+    assert cache.get("a") is None, "Expected the entry to expire after its TTL"
+    assert len(cache) == 0, "Expected the expired entry to be dropped"
+
+def test_user_cache_counts_hits_and_misses(fake_user_cache: UserCache):
+    user = make_user(version=3)
+    assert fake_user_cache.get(user.id) is None
+    fake_user_cache.set(user, fake_user_cache.generation)
+    cached = fake_user_cache.get(user.id)
+
+    assert cached == user and cached.version == 3, f"Expected {user!r} with its version, but got {cached!r}"
+    assert (fake_user_cache.hits, fake_user_cache.misses) == (1, 1), f"Expected 1 hit and 1 miss, but got {fake_user_cache.status()}"
+
+def test_user_cache_skips_user_read_before_invalidation(fake_user_cache: UserCache):
+    user = make_user()
+    generation = fake_user_cache.generation
+    fake_user_cache.invalidate([user.id])
+    fake_user_cache.set(user, generation)
+
+    assert fake_user_cache.get(user.id) is None, "Expected a user read before the invalidation not to be cached"
+
+def test_user_cache_invalidated_after_commit(fake_user_cache: UserCache):
+    user = make_user()
+    with Session(create_engine("sqlite://")) as session:
+        fake_user_cache.set(user, fake_user_cache.generation)
+        invalidate_users(session, [user.id])
+        assert fake_user_cache.get(user.id) is None, "Expected the entry to be dropped before commit"
+
+        # A concurrent reader caches the pre-commit row after the first invalidation
+        fake_user_cache.set(user, fake_user_cache.generation)
+        session.commit()
+
+    assert fake_user_cache.get(user.id) is None, "Expected the entry to be dropped again after commit"
+
+def test_user_cache_not_invalidated_after_rollback(fake_user_cache: UserCache):
+    user = make_user()
+    with Session(create_engine("sqlite://")) as session:
+        session.execute(text("SELECT 1"))
+        invalidate_users(session, [user.id])
+        fake_user_cache.set(user, fake_user_cache.generation)
+        session.rollback()
+        session.commit()
+
+    assert fake_user_cache.get(user.id) == user, "Expected a rolled back write not to invalidate on a later commit"
+
+def test_blocking_backend_is_called_off_the_event_loop(fake_user_cache: UserCache):
+    fake_user_cache.backend = backend = FakeBackend(blocking=True)
+    user = make_user()
+
+    async def commit_update() -> User | None:
+        async with AsyncSession(create_async_engine("sqlite+aiosqlite://")) as session:
+            await fake_user_cache.set_async(user, fake_user_cache.generation)
+            await session.execute(text("SELECT 1"))
+            await invalidate_users_async(session, [user.id])
+            await fake_user_cache.set_async(user, fake_user_cache.generation)
+            await session.commit()
+        return await fake_user_cache.get_async(user.id)
+
+    assert asyncio.run(commit_update()) is None, "Expected the async commit to invalidate the user"
+    loop_thread = threading.current_thread()
+    assert loop_thread not in backend.threads, "Expected every call to a blocking backend to run in a worker thread"
\ No newline at end of file
@@ -3,7 +3,7 @@ import pytest
 from http import HTTPStatus
 from jsonschema import validate
 
-from app.models.User import User
+from app.models.User import User, UserUpdate
 from clients.user_client import UserApiClient
 from schemas.single_user_schema import single_user
 
@@ -54,4 +54,44 @@ def test_get_user_with_non_positive_id(user_client: UserApiClient, user_id: int,
     response = user_client.get_user(user_id)
     assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY, f"ERROR {response.status_code} {response.text}"
     body = response.json()
-    assert body["message"] == err_msg, f"Expected message {err_msg}, but got {body}"
\ No newline at end of file
+    assert body["message"] == err_msg, f"Expected message {err_msg}, but got {body}"
+
+def test_user_etag_not_modified(user_client: UserApiClient, created_user: dict, created_user_cleanup: list[int]):
+    user_id = created_user["id"]
+    created_user_cleanup.append(user_id)
+    response = user_client.get_user(user_id)
+    etag = response.headers.get("ETag")
+    assert etag, "Expected ETag header in response"
+
+    not_modified = user_client.get_user_if_none_match(user_id, etag)
+    assert not_modified.status_code == HTTPStatus.NOT_MODIFIED, f"ERROR {not_modified.status_code} {not_modified.text}"
+    assert not_modified.content == b"", "Expected empty body for 304 response"
+    assert not_modified.headers["ETag"] == etag
+
+    cached = user_client.get_user(user_id)
+    assert cached.status_code == HTTPStatus.OK
+    assert cached.json() == response.json()
+
+def test_user_etag_changes_on_update(user_client: UserApiClient, created_user: dict, created_user_cleanup: list[int]):
+    user_id = created_user["id"]
+    created_user_cleanup.append(user_id)
+    etag = user_client.get_user(user_id).headers["ETag"]
+
+    user_client.update_user_validated(user_id=user_id, user=UserUpdate(first_name="Etagchanged"))
+    response = user_client.get_user_if_none_match(user_id, etag)
+
+    assert response.status_code == HTTPStatus.OK, f"ERROR {response.status_code} {response.text}"
+    assert response.headers["ETag"] != etag, "Expected a new ETag after update"
+    assert response.json()["first_name"] == "Etagchanged"
+    assert user_client.get_user(user_id).json()["first_name"] == "Etagchanged"
+def test_user_etag_changes_on_bulk_update(user_client: UserApiClient, created_user: dict, created_user_cleanup: list[int]):
+    user_id = created_user["id"]
+    created_user_cleanup.append(user_id)
+    etag = user_client.get_user(user_id).headers["ETag"]
+    assert etag == f'W/"{user_id}-1"', f"Expected an id-version ETag for a new user, but got {etag}"
+
+    user_client.update_users_bulk(user_ids=[user_id], user=UserUpdate(last_name="Etagbulk"))
+    response = user_client.get_user_if_none_match(user_id, etag)
+
+    assert response.status_code == HTTPStatus.OK, f"ERROR {response.status_code} {response.text}"
+    assert response.headers["ETag"] == f'W/"{user_id}-2"', f"Expected the version bumped by the bulk update, but got {response.headers['ETag']}"
\ No newline at end of file
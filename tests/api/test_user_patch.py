@@ -118,3 +118,13 @@ def test_update_user_invalid_method(user_client: UserApiClient, created_user: di
     body = response.json()
     created_user_cleanup.append(user_id)
     assert body["detail"] == detail, f"Expected detail {detail}, but got {body['detail']}"
+
+@pytest.mark.parametrize("field", ["email", "first_name", "last_name", "avatar"])
+def test_update_user_null_field(user_client: UserApiClient, created_user: dict, created_user_cleanup: list[int], field: str):
+    user_id = created_user["id"]
+    created_user_cleanup.append(user_id)
+    response = user_client.update_user_raw(user_id=user_id, user={field: None})
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY, f"ERROR {response.status_code} {response.text}"
+
+    api_user = user_client.get_user(user_id=user_id).json()
+    assert api_user[field] == created_user[field], f"Expected {field} {created_user[field]}, but got {api_user[field]}"
\ No newline at end of file
@@ -112,4 +112,14 @@ def test_create_user_invalid_method(user_client: UserApiClient, detail: str, met
     response = user_client.create_user_raw(user=payload, method=method)
     assert response.status_code == HTTPStatus.METHOD_NOT_ALLOWED, f"ERROR {response.status_code} {response.text}"
     body = response.json()
-    assert body["detail"] == detail, f"Expected detail {detail}, but got {body['detail']}"
\ No newline at end of file
+    assert body["detail"] == detail, f"Expected detail {detail}, but got {body['detail']}"
+
+@pytest.mark.parametrize("err_msg", ["User with this email already exists"])
+def test_create_user_duplicate_email(user_client: UserApiClient, created_user: dict, created_user_cleanup: list[int], user_payload_factory: Callable[[], dict[str, Any]], err_msg: str):
+    created_user_cleanup.append(created_user["id"])
+    payload = {**user_payload_factory(), "email": created_user["email"]}
+
+    response = user_client.create_user_raw(user=payload)
+    assert response.status_code == HTTPStatus.CONFLICT, f"ERROR {response.status_code} {response.text}"
+    body = response.json()
+    assert body["message"] == err_msg, f"Expected message {err_msg}, but got {body}"
\ No newline at end of file
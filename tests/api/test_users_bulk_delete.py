@@ -0,0 +1,43 @@
+import pytest
+from typing import Callable, Any
+from http import HTTPStatus
+
+from app.models.User import UserCreate
+from clients.user_client import UserApiClient
+
+@pytest.mark.parametrize("err_msg", ["User not found"])
+def test_delete_users_bulk(user_client: UserApiClient, user_payload_factory: Callable[[], dict[str, Any]], err_msg: str):
+    response = user_client.create_users_bulk(users=[UserCreate(**user_payload_factory()) for _ in range(3)])
+    user_ids = [user["id"] for user in response.json()["created"]]
+
+    response = user_client.delete_users_bulk(user_ids)
+    assert response.status_code == HTTPStatus.OK, f"ERROR {response.status_code} {response.text}"
+    body = response.json()
+
+    assert body["ids"] == sorted(user_ids), f"Expected deleted ids {sorted(user_ids)}, but got {body['ids']}"
+    assert body["not_found"] == [], f"Expected no missing ids, but got {body['not_found']}"
+    for user_id in user_ids:
+        api_deleted_user = user_client.get_user(user_id)
+        assert api_deleted_user.status_code == HTTPStatus.NOT_FOUND
+        assert api_deleted_user.json()["message"] == err_msg, f"Expected message {err_msg}, but got {api_deleted_user.json()}"
+
+def test_delete_users_bulk_reports_not_found(user_client: UserApiClient, created_user: dict):
+    user_id = created_user["id"]
+    user_client.delete_user(user_id)
+
+    response = user_client.delete_users_bulk([user_id, user_id])
+    assert response.status_code == HTTPStatus.OK, f"ERROR {response.status_code} {response.text}"
+    body = response.json()
+
+    assert body["ids"] == [], f"Expected no deleted ids, but got {body['ids']}"
+    assert body["not_found"] == [user_id], f"Expected missing ids {[user_id]}, but got {body['not_found']}"
+
+def test_delete_users_bulk_empty(user_client: UserApiClient):
+    response = user_client.delete_users_bulk([])
+    assert response.status_code == HTTPStatus.OK, f"ERROR {response.status_code} {response.text}"
+    assert response.json() == {"ids": [], "not_found": []}
+
+@pytest.mark.parametrize("user_ids", [[0], [-1], ["abc"]])
+def test_delete_users_bulk_with_invalid_ids(user_client: UserApiClient, user_ids: list):
+    response = user_client.delete_users_bulk(user_ids)
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY, f"ERROR {response.status_code} {response.text}"
\ No newline at end of file
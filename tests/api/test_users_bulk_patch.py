@@ -0,0 +1,68 @@
+import pytest
+from typing import Callable, Any
+from http import HTTPStatus
+
+from app.models.User import UserCreate, UserUpdate
+from clients.user_client import UserApiClient
+
+@pytest.fixture
+def created_users(user_client: UserApiClient, user_payload_factory: Callable[[], dict[str, Any]], created_user_cleanup: list[int]) -> list[dict]:
+    response = user_client.create_users_bulk(users=[UserCreate(**user_payload_factory()) for _ in range(3)])
+    assert response.status_code == HTTPStatus.CREATED
+    users = response.json()["created"]
+    created_user_cleanup.extend(user["id"] for user in users)
+    return users
+
+def test_update_users_bulk(user_client: UserApiClient, created_users: list[dict]):
+    user_ids = [user["id"] for user in created_users]
+    payload = {"last_name": "Bulkupdated"}
+
+    response = user_client.update_users_bulk(user_ids=user_ids, user=UserUpdate(**payload))
+    assert response.status_code == HTTPStatus.OK, f"ERROR {response.status_code} {response.text}"
+    body = response.json()
+
+    assert body["ids"] == sorted(user_ids), f"Expected updated ids {sorted(user_ids)}, but got {body['ids']}"
+    assert body["not_found"] == [], f"Expected no missing ids, but got {body['not_found']}"
+    for user in created_users:
+        api_user = user_client.get_user(user["id"]).json()
+        assert api_user["last_name"] == payload["last_name"], f"Expected last_name {payload['last_name']}, but got {api_user['last_name']}"
+        assert api_user["first_name"] == user["first_name"], f"Expected first_name {user['first_name']}, but got {api_user['first_name']}"
+
+def test_update_users_bulk_reports_not_found(user_client: UserApiClient, created_users: list[dict]):
+    existing_id = created_users[0]["id"]
+    missing_id = created_users[-1]["id"]
+    user_client.delete_user(missing_id)
+
+    response = user_client.update_users_bulk(user_ids=[existing_id, missing_id], user=UserUpdate(first_name="Bulk"))
+    assert response.status_code == HTTPStatus.OK, f"ERROR {response.status_code} {response.text}"
+    body = response.json()
+
+    assert body["ids"] == [existing_id], f"Expected updated ids {[existing_id]}, but got {body['ids']}"
+    assert body["not_found"] == [missing_id], f"Expected missing ids {[missing_id]}, but got {body['not_found']}"
+
+@pytest.mark.parametrize("err_msg", ["No fields to update"])
+def test_update_users_bulk_without_changes(user_client: UserApiClient, created_users: list[dict], err_msg: str):
+    response = user_client.update_users_bulk_raw(payload={"ids": [created_users[0]["id"]], "changes": {}})
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY, f"ERROR {response.status_code} {response.text}"
+    body = response.json()
+    assert body["message"] == err_msg, f"Expected message {err_msg}, but got {body}"
+
+@pytest.mark.parametrize("payload", [
+    {"ids": [0], "changes": {"first_name": "Bulk"}},
+    {"ids": [-1], "changes": {"first_name": "Bulk"}},
+    {"ids": [1], "changes": {"email": "tracey.ramos@"}},
+    {"ids": [1], "changes": {"avatar": "not-a-url"}},
+    {"changes": {"first_name": "Bulk"}},
+])
+def test_update_users_bulk_invalid_payload(user_client: UserApiClient, payload: dict):
+    response = user_client.update_users_bulk_raw(payload=payload)
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY, f"ERROR {response.status_code} {response.text}"
+@pytest.mark.parametrize("field", ["email", "first_name", "last_name", "avatar"])
+def test_update_users_bulk_null_field(user_client: UserApiClient, created_users: list[dict], field: str):
+    user_ids = [user["id"] for user in created_users]
+    response = user_client.update_users_bulk_raw(payload={"ids": user_ids, "changes": {"last_name": "Bulknull", field: None}})
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY, f"ERROR {response.status_code} {response.text}"
+
+    for user in created_users:
+        api_user = user_client.get_user(user["id"]).json()
+        assert api_user == user, f"Expected user {user['id']} unchanged, but got {api_user}"
\ No newline at end of file
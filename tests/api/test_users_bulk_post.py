@@ -0,0 +1,74 @@
+from typing import Callable, Any
+
+import pytest
+from http import HTTPStatus
+
+from app.models.User import UserCreate
+from clients.user_client import UserApiClient
+
+def test_create_users_bulk(
+        user_client: UserApiClient,
+        user_payload_factory: Callable[[], dict[str, Any]],
+        created_user_cleanup: list[int]
+):
+    payloads = [user_payload_factory() for _ in range(5)]
+
+    response = user_client.create_users_bulk(users=[UserCreate(**payload) for payload in payloads])
+    assert response.status_code == HTTPStatus.CREATED, f"ERROR {response.status_code} {response.text}"
+    body = response.json()
+
+    created_user_cleanup.extend(user["id"] for user in body["created"])
+
+    assert body["errors"] == [], f"Expected no errors, but got {body['errors']}"
+    assert len(body["created"]) == len(payloads), f"Expected {len(payloads)} created users, but got {len(body['created'])}"
+    for payload, user in zip(payloads, body["created"]):
+        api_response = user_client.get_user(user_id=user["id"])
+        assert api_response.status_code == HTTPStatus.OK
+        api_user = api_response.json()
+        assert api_user["email"] == payload["email"], f"Expected email {payload['email']}, but got {api_user['email']}"
+        assert api_user == user, f"Expected user {user}, but got {api_user}"
+
+def test_create_users_bulk_reports_invalid_items(
+        user_client: UserApiClient,
+        user_payload_factory: Callable[[], dict[str, Any]],
+        created_user_cleanup: list[int]
+):
+    valid_user = user_payload_factory()
+    invalid_email = {**user_payload_factory(), "email": "tracey.ramos@"}
+    missing_avatar = {key: value for key, value in user_payload_factory().items() if key != "avatar"}
+
+    response = user_client.create_users_bulk_raw(users=[invalid_email, valid_user, missing_avatar])
+    assert response.status_code == HTTPStatus.CREATED, f"ERROR {response.status_code} {response.text}"
+    body = response.json()
+
+    created_user_cleanup.extend(user["id"] for user in body["created"])
+
+    assert [user["email"] for user in body["created"]] == [valid_user["email"]]
+    assert [error["index"] for error in body["errors"]] == [0, 2], f"Expected errors for items 0 and 2, but got {body['errors']}"
+    assert body["errors"][0]["errors"][0]["loc"] == ["email"]
+    assert body["errors"][1]["errors"][0]["loc"] == ["avatar"]
+
+@pytest.mark.parametrize("payload", [{}, "users", None])
+def test_create_users_bulk_not_a_list(user_client: UserApiClient, payload: Any):
+    response = user_client.create_users_bulk_raw(users=payload)
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY, f"ERROR {response.status_code} {response.text}"
+
+def test_create_users_bulk_reports_duplicate_emails(
+        user_client: UserApiClient,
+        user_payload_factory: Callable[[], dict[str, Any]],
+        created_user: dict,
+        created_user_cleanup: list[int]
+):
+    created_user_cleanup.append(created_user["id"])
+    new_user = user_payload_factory()
+    existing_email = {**user_payload_factory(), "email": created_user["email"]}
+    repeated_email = {**user_payload_factory(), "email": new_user["email"]}
+
+    response = user_client.create_users_bulk_raw(users=[existing_email, new_user, repeated_email])
+    assert response.status_code == HTTPStatus.CREATED, f"ERROR {response.status_code} {response.text}"
+    body = response.json()
+
+    created_user_cleanup.extend(user["id"] for user in body["created"])
+
+    assert [user["email"] for user in body["created"]] == [new_user["email"]]
+    assert [error["index"] for error in body["errors"]] == [0, 2], f"Expected errors for items 0 and 2, but got {body['errors']}"
\ No newline at end of file
@@ -0,0 +1,103 @@
+import pytest
+from http import HTTPStatus
+from types import SimpleNamespace
+from typing import Callable
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.database import user_count as user_count_module
+from app.database.user_count import CountCache, count_config, users_count_cache, users_count_changed
+from app.models.User import UserCreate
+from clients.user_client import UserApiClient
+
+@pytest.fixture
+def clock(monkeypatch) -> list[float]:
+    now = [100.0]
+    monkeypatch.setattr("app.database.user_count.time", SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+@pytest.fixture
+def fresh_count_cache(monkeypatch) -> CountCache:
+    # Replaces the cache the commit hooks invalidate
+    cache = CountCache(ttl_seconds=30)
+    monkeypatch.setattr(user_count_module, "users_count_cache", cache)
+    return cache
+
+@pytest.fixture
+def count_strategy(env: str, monkeypatch) -> Callable[[str], None]:
+    # The strategy is read per request, so the in-process app can switch it; a served app keeps its own setting
+    if env != "inproc":
+        pytest.skip("Switching USERS_COUNT_STRATEGY needs the in-process app (--env inproc)")
+
+    def _set(strategy: str) -> None:
+        monkeypatch.setattr(count_config, "strategy", strategy)
+        users_count_cache.invalidate()
+    return _set
+
+def users_total(user_client: UserApiClient) -> int:
+    response = user_client.get_users(page=1, size=1)
+    assert response.status_code == HTTPStatus.OK, f"ERROR {response.status_code} {response.text}"
+    return response.json()["total"]
+
+def test_count_cache_reused_within_ttl(clock: list[float]):
+    cache = CountCache(ttl_seconds=30)
+    cache.set(42, cache.generation)
+
+    clock[0] = 129.9
+    assert cache.get() == 42, "Expected the count within its TTL"
+    clock[0] = 130.1
+    assert cache.get() is None, "Expected the count to expire after its TTL"
+    assert (cache.hits, cache.misses) == (1, 1), f"Expected 1 hit and 1 miss, but got {cache.hits} and {cache.misses}"
+
+def test_count_cache_skips_count_read_before_invalidation():
+    cache = CountCache(ttl_seconds=30)
+    generation = cache.generation
+    cache.invalidate()
+    cache.set(42, generation)
+
+    assert cache.get() is None, "Expected a count read before the invalidation not to be cached"
+
+def test_count_cache_dropped_after_commit(fresh_count_cache: CountCache):
+    with Session(create_engine("sqlite://")) as session:
+        session.execute(text("SELECT 1"))
+        users_count_changed(session)
+        # A concurrent reader counts before this commit and caches the old total
+        fresh_count_cache.set(42, fresh_count_cache.generation)
+        session.commit()
+
+    assert fresh_count_cache.get() is None, "Expected the count to be dropped after commit"
+
+def test_count_cache_kept_after_rollback(fresh_count_cache: CountCache):
+    with Session(create_engine("sqlite://")) as session:
+        session.execute(text("SELECT 1"))
+        users_count_changed(session)
+        fresh_count_cache.set(42, fresh_count_cache.generation)
+        session.rollback()
+        session.commit()
+
+    assert fresh_count_cache.get() == 42, "Expected a rolled back write not to drop the count on a later commit"
+
+@pytest.mark.usefixtures("fill_test_data")
+def test_cached_total_reused_until_create_or_delete(user_client: UserApiClient, count_strategy: Callable[[str], None], user_payload_factory: Callable[[], dict]):
+    count_strategy("cached")
+    total = users_total(user_client)
+    hits = users_count_cache.hits
+    assert users_total(user_client) == total
+    assert users_count_cache.hits == hits + 1, "Expected the second page request to reuse the cached total"
+
+    response = user_client.create_user_validated(user=UserCreate(**user_payload_factory()))
+    assert response.status_code == HTTPStatus.CREATED, f"ERROR {response.status_code} {response.text}"
+    assert users_total(user_client) == total + 1, "Expected the cached total to be dropped after a create"
+
+    assert user_client.delete_user(response.json()["id"]).status_code == HTTPStatus.NO_CONTENT
+    assert users_total(user_client) == total, "Expected the cached total to be dropped after a delete"
+
+@pytest.mark.usefixtures("fill_test_data")
+def test_estimated_total_falls_back_to_exact_count(user_client: UserApiClient, count_strategy: Callable[[str], None]):
+    # SQLite has no planner estimate, so the estimated strategy counts exactly
+    count_strategy("exact")
+    exact = users_total(user_client)
+    count_strategy("estimated")
+
+    assert users_total(user_client) == exact, f"Expected the exact total {exact} without a planner estimate"
\ No newline at end of file
@@ -0,0 +1,65 @@
+import pytest
+from http import HTTPStatus
+
+from clients.user_client import UserApiClient
+
+@pytest.mark.usefixtures("fill_test_data")
+@pytest.mark.parametrize("fields, expected_keys", [
+    ("id,email", {"id", "email"}),
+    ("first_name, last_name", {"first_name", "last_name"}),
+    ("avatar,id,avatar", {"id", "avatar"}),
+])
+def test_user_fields_projection(user_client: UserApiClient, fill_test_data: list[int], fields: str, expected_keys: set):
+    user_id = fill_test_data[0]
+    full_user = user_client.get_user(user_id).json()
+
+    response = user_client.get_user_fields(user_id, fields)
+    assert response.status_code == HTTPStatus.OK, f"ERROR {response.status_code} {response.text}"
+    body = response.json()
+
+    assert set(body) == expected_keys, f"Expected keys {expected_keys}, but got {set(body)}"
+    for key in expected_keys:
+        assert body[key] == full_user[key], f"Expected {key}={full_user[key]}, but got {body[key]}"
+
+def test_user_fields_not_found(user_client: UserApiClient):
+    response = user_client.get_user_fields(10 ** 9, "id,email")
+    assert response.status_code == HTTPStatus.NOT_FOUND, f"ERROR {response.status_code} {response.text}"
+
+@pytest.mark.usefixtures("fill_test_data")
+def test_users_page_fields_projection(user_client: UserApiClient, namespace_filter: dict):
+    full_page = user_client.get_users(page=1, size=5, **namespace_filter).json()
+
+    response = user_client.get_users(page=1, size=5, fields="id,email", **namespace_filter)
+    assert response.status_code == HTTPStatus.OK, f"ERROR {response.status_code} {response.text}"
+    body = response.json()
+
+    for key in ("total", "page", "size", "pages"):
+        assert body[key] == full_page[key], f"Expected {key}={full_page[key]}, but got {body[key]}"
+    expected_items = [{"id": user["id"], "email": user["email"]} for user in full_page["items"]]
+    assert body["items"] == expected_items, f"Expected {expected_items}, but got {body['items']}"
+
+@pytest.mark.usefixtures("fill_test_data")
+def test_users_page_fields_with_filters(user_client: UserApiClient, all_users: list, namespace_filter: dict):
+    last_name = all_users[0]["last_name"]
+    expected_ids = [user["id"] for user in all_users if user["last_name"] == last_name]
+
+    response = user_client.get_users(size=100, fields="id", last_name=last_name, **namespace_filter)
+    assert response.status_code == HTTPStatus.OK, f"ERROR {response.status_code} {response.text}"
+    body = response.json()
+
+    assert body["total"] == len(expected_ids), f"Expected total {len(expected_ids)}, but got {body['total']}"
+    assert body["items"] == [{"id": user_id} for user_id in expected_ids]
+
+@pytest.mark.usefixtures("fill_test_data")
+def test_all_users_fields_projection(user_client: UserApiClient, all_users: list):
+    response = user_client.get_all_users(fields="id,last_name")
+    assert response.status_code == HTTPStatus.OK, f"ERROR {response.status_code} {response.text}"
+
+    expected = [{"id": user["id"], "last_name": user["last_name"]} for user in all_users]
+    seed_ids = {user["id"] for user in all_users}
+    assert [user for user in response.json() if user["id"] in seed_ids] == expected, "Expected projected stream to match full stream"
+
+@pytest.mark.parametrize("fields", ["password", "id,version", "", ","])
+def test_user_fields_invalid(user_client: UserApiClient, fields: str):
+    response = user_client.get_users(fields=fields)
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY, f"ERROR {response.status_code} {response.text}"
\ No newline at end of file
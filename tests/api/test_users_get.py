@@ -1,4 +1,6 @@
+import json
 import pytest
+from typing import Callable
 from http import HTTPStatus
 
 from app.models.User import User
@@ -15,4 +17,25 @@ def test_users(user_client: UserApiClient):
 @pytest.mark.usefixtures("fill_test_data")
 def test_user_no_duplicates(all_users: list):
     user_ids = [user["id"] for user in all_users]
-    assert len(user_ids) == len(set(user_ids))
\ No newline at end of file
+    assert len(user_ids) == len(set(user_ids))
+
+@pytest.mark.usefixtures("fill_test_data")
+def test_all_users_streamed_as_json_array(user_client: UserApiClient):
+    response = user_client.get_all_users()
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["Content-Type"] == "application/json", f"Expected Content-Type = application/json, but got {response.headers['Content-Type']}"
+    user_list = response.json()
+    assert isinstance(user_list, list)
+    for user in user_list:
+        User.model_validate(user)
+
+@pytest.mark.usefixtures("fill_test_data")
+def test_export_users_ndjson(user_client: UserApiClient, all_users: list, in_namespace: Callable):
+    response = user_client.export_users()
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["Content-Type"] == "application/x-ndjson", f"Expected Content-Type = application/x-ndjson, but got {response.headers['Content-Type']}"
+
+    exported_users = [json.loads(line) for line in response.iter_lines() if line]
+    for user in exported_users:
+        User.model_validate(user)
+    assert [user["id"] for user in in_namespace(exported_users)] == [user["id"] for user in all_users]
\ No newline at end of file
@@ -0,0 +1,47 @@
+import pytest
+from typing import Callable
+from http import HTTPStatus
+
+from app.models.User import User
+from clients.user_client import UserApiClient
+
+@pytest.mark.usefixtures("fill_test_data")
+@pytest.mark.parametrize("size", [5, 30, 100])
+def test_users_cursor_pages_cover_all_users(user_client: UserApiClient, all_users: list, in_namespace: Callable, size: int):
+    users = list(user_client.iterate_users_by_cursor(size=size))
+    ids = [user["id"] for user in users]
+
+    assert ids == sorted(ids), "Expected users ordered by id across cursor pages"
+    assert len(ids) == len(set(ids)), "Expected no user on more than one cursor page"
+    ids = [user["id"] for user in in_namespace(users)]
+    assert ids == sorted(user["id"] for user in all_users), "Expected cursor pages to cover all users exactly once"
+
+@pytest.mark.usefixtures("fill_test_data")
+@pytest.mark.parametrize("size", [10, 25])
+def test_users_cursor_page_structure(user_client: UserApiClient, size: int):
+    response = user_client.get_users_by_cursor(size=size)
+    assert response.status_code == HTTPStatus.OK, f"ERROR {response.status_code} {response.text}"
+    body = response.json()
+
+    assert len(body["items"]) == size, f"Expected user count {size}, but got {len(body['items'])}"
+    assert body["next_page"], "Expected cursor for the next page"
+    for user in body["items"]:
+        User.model_validate(user)
+
+    next_response = user_client.get_users_by_cursor(cursor=body["next_page"], size=size)
+    assert next_response.status_code == HTTPStatus.OK
+    next_ids = [user["id"] for user in next_response.json()["items"]]
+    assert min(next_ids) > body["items"][-1]["id"], "Expected next page to start after the last seen user"
+
+@pytest.mark.usefixtures("fill_test_data")
+@pytest.mark.parametrize("cursor, err_msg", [("not-base64!", "Invalid cursor value"), ("YWJj", "Invalid cursor value")])
+def test_users_invalid_cursor(user_client: UserApiClient, cursor: str, err_msg: str):
+    response = user_client.get_users_by_cursor(cursor=cursor)
+    assert response.status_code == HTTPStatus.BAD_REQUEST, f"ERROR {response.status_code} {response.text}"
+    body = response.json()
+    assert body["message"] == err_msg, f"Expected message {err_msg}, but got {body}"
+
+@pytest.mark.parametrize("size", [-1, 0, 101, "abc"])
+def test_users_cursor_invalid_size(user_client: UserApiClient, size: int | str):
+    response = user_client.get_users_by_cursor(size=size)
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY, f"Expected status code 422, but got {response.status_code}"
\ No newline at end of file
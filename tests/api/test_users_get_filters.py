@@ -0,0 +1,71 @@
+import pytest
+from http import HTTPStatus
+
+from clients.user_client import UserApiClient
+
+@pytest.mark.usefixtures("fill_test_data")
+@pytest.mark.parametrize("email", ["george.bluth@reqres.in", "tracey.ramos@reqres.in"])
+def test_users_filter_by_email(user_client: UserApiClient, data_namespace: str, email: str):
+    email = f"{data_namespace}{email}"
+    response = user_client.get_users(email=email)
+    assert response.status_code == HTTPStatus.OK, f"ERROR {response.status_code} {response.text}"
+    body = response.json()
+
+    assert body["total"] == 1, f"Expected total 1, but got {body['total']}"
+    assert [user["email"] for user in body["items"]] == [email]
+
+@pytest.mark.usefixtures("fill_test_data")
+@pytest.mark.parametrize("email_prefix", ["george", "t", "michael.l"])
+def test_users_filter_by_email_prefix(user_client: UserApiClient, all_users: list, data_namespace: str, email_prefix: str):
+    email_prefix = f"{data_namespace}{email_prefix}"
+    expected_ids = [user["id"] for user in all_users if user["email"].startswith(email_prefix)]
+
+    response = user_client.get_users(email_prefix=email_prefix, size=100)
+    assert response.status_code == HTTPStatus.OK, f"ERROR {response.status_code} {response.text}"
+    body = response.json()
+
+    assert expected_ids, f"Expected test data with email prefix {email_prefix}"
+    assert body["total"] == len(expected_ids), f"Expected total {len(expected_ids)}, but got {body['total']}"
+    assert [user["id"] for user in body["items"]] == expected_ids
+
+@pytest.mark.usefixtures("fill_test_data")
+def test_users_filter_by_email_prefix_escapes_wildcards(user_client: UserApiClient):
+    response = user_client.get_users(email_prefix="%")
+    assert response.status_code == HTTPStatus.OK, f"ERROR {response.status_code} {response.text}"
+    assert response.json()["total"] == 0, "Expected '%' to be matched literally"
+
+@pytest.mark.usefixtures("fill_test_data")
+@pytest.mark.parametrize("field", ["first_name", "last_name"])
+def test_users_filter_by_name(user_client: UserApiClient, all_users: list, namespace_filter: dict, field: str):
+    value = all_users[0][field]
+    expected_ids = [user["id"] for user in all_users if user[field] == value]
+
+    response = user_client.get_users(size=100, **{field: value}, **namespace_filter)
+    assert response.status_code == HTTPStatus.OK, f"ERROR {response.status_code} {response.text}"
+    body = response.json()
+
+    assert body["total"] == len(expected_ids), f"Expected total {len(expected_ids)}, but got {body['total']}"
+    assert [user["id"] for user in body["items"]] == expected_ids
+
+# Seed names are plain capitalised ASCII, so Python ordering matches any database collation for them
+@pytest.mark.parametrize("sort_by", ["id", "first_name", "last_name"])
+@pytest.mark.parametrize("order", ["asc", "desc"])
+def test_users_sorting(user_client: UserApiClient, fill_test_data: list[int], all_users: list, namespace_filter: dict, sort_by: str, order: str):
+    seed_ids = set(fill_test_data)
+    seed_users = [user for user in all_users if user["id"] in seed_ids]
+    expected = sorted(seed_users, key=lambda user: user["id"], reverse=order == "desc")
+    expected = sorted(expected, key=lambda user: user[sort_by], reverse=order == "desc")
+
+    ids, page, pages = [], 1, 1
+    while page <= pages:
+        body = user_client.get_users(page=page, size=100, sort_by=sort_by, order=order, **namespace_filter).json()
+        ids.extend(user["id"] for user in body["items"] if user["id"] in seed_ids)
+        page, pages = page + 1, body["pages"]
+
+    assert ids == [user["id"] for user in expected], f"Expected users sorted by {sort_by} {order}"
+
+@pytest.mark.usefixtures("fill_test_data")
+@pytest.mark.parametrize("params", [{"sort_by": "avatar"}, {"sort_by": "password"}, {"order": "up"}, {"email_prefix": ""}])
+def test_users_invalid_filters(user_client: UserApiClient, params: dict):
+    response = user_client.get_users(**params)
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY, f"ERROR {response.status_code} {response.text}"
\ No newline at end of file
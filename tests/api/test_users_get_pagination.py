@@ -7,12 +7,12 @@ from clients.user_client import UserApiClient
 
 @pytest.mark.usefixtures("fill_test_data")
 @pytest.mark.parametrize("page, size", [(1, 30), (2, 30), (4, 5)])
-def test_users_items_count_respects_page_and_size(user_client: UserApiClient, all_users_count: int, page: int, size: int):
+def test_users_items_count_respects_page_and_size(user_client: UserApiClient, namespace_filter: dict, all_users_count: int, page: int, size: int):
     last_page = math.ceil(all_users_count / size)
     if page >= last_page:
         pytest.skip(f"Skipping test because page {page} is the last page or beyond. Total pages: {last_page}")
 
-    response = user_client.get_users(page=page, size=size)
+    response = user_client.get_users(page=page, size=size, **namespace_filter)
     assert response.status_code == 200
 
     body = response.json()
@@ -22,10 +22,10 @@ def test_users_items_count_respects_page_and_size(user_client: UserApiClient, al
 
 @pytest.mark.usefixtures("fill_test_data")
 @pytest.mark.parametrize("size", [30, 20, 100])
-def test_users_items_count_on_last_page(user_client: UserApiClient, all_users_count: int, size: int):
+def test_users_items_count_on_last_page(user_client: UserApiClient, namespace_filter: dict, all_users_count: int, size: int):
     last_page = math.ceil(all_users_count / size)
     expected_last_page_count = all_users_count % size or size
-    response = user_client.get_users(page=last_page, size=size)
+    response = user_client.get_users(page=last_page, size=size, **namespace_filter)
     body = response.json()
 
     assert response.status_code == 200
@@ -33,8 +33,8 @@ def test_users_items_count_on_last_page(user_client: UserApiClient, all_users_co
 
 @pytest.mark.usefixtures("fill_test_data")
 @pytest.mark.parametrize("page, size", [(1, 10),(1, 25), (2, 20), (3, 5), (1, 100)])
-def test_users_pagination_metadata(user_client: UserApiClient, all_users_count: int, page: int, size: int):
-    response = user_client.get_users(page=page, size=size)
+def test_users_pagination_metadata(user_client: UserApiClient, namespace_filter: dict, all_users_count: int, page: int, size: int):
+    response = user_client.get_users(page=page, size=size, **namespace_filter)
 
     assert response.status_code == 200
 
@@ -48,9 +48,9 @@ def test_users_pagination_metadata(user_client: UserApiClient, all_users_count:
 
 @pytest.mark.usefixtures("fill_test_data")
 @pytest.mark.parametrize("first_page, second_page, size", [(1, 2, 25), (3, 4, 10)])
-def test_users_return_different_data_on_different_pages(user_client: UserApiClient, first_page: int, second_page: int, size: int):
-    r1 = user_client.get_users(page=first_page, size=size).json()
-    r2 = user_client.get_users(page=second_page, size=size).json()
+def test_users_return_different_data_on_different_pages(user_client: UserApiClient, namespace_filter: dict, first_page: int, second_page: int, size: int):
+    r1 = user_client.get_users(page=first_page, size=size, **namespace_filter).json()
+    r2 = user_client.get_users(page=second_page, size=size, **namespace_filter).json()
 
     ids_page_1 = [user["id"] for user in r1["items"]]
     ids_page_2 = [user["id"] for user in r2["items"]]
@@ -59,8 +59,8 @@ def test_users_return_different_data_on_different_pages(user_client: UserApiClie
 
 @pytest.mark.usefixtures("fill_test_data")
 @pytest.mark.parametrize("page, size", [(1, 30), (4, 3), (3, 20)])
-def test_users_user_model_validation_by_pagination(user_client: UserApiClient, page: int, size:int):
-    response = user_client.get_users(page=page, size=size)
+def test_users_user_model_validation_by_pagination(user_client: UserApiClient, namespace_filter: dict, page: int, size:int):
+    response = user_client.get_users(page=page, size=size, **namespace_filter)
     assert response.status_code == 200
 
     body = response.json()
@@ -73,8 +73,8 @@ def test_users_user_model_validation_by_pagination(user_client: UserApiClient, p
 
 @pytest.mark.usefixtures("fill_test_data")
 @pytest.mark.parametrize("default_page, default_size", [(1, 50)])
-def test_users_default_pagination(user_client: UserApiClient, all_users_count: int, default_page: int, default_size: int):
-    response = user_client.get_users()
+def test_users_default_pagination(user_client: UserApiClient, namespace_filter: dict, all_users_count: int, default_page: int, default_size: int):
+    response = user_client.get_users(**namespace_filter)
     assert response.status_code == 200
 
     body = response.json()
@@ -94,8 +94,8 @@ def test_users_default_pagination(user_client: UserApiClient, all_users_count: i
 
 @pytest.mark.usefixtures("fill_test_data")
 @pytest.mark.parametrize("page", [999, 2500])
-def test_users_empty_data_on_page(user_client: UserApiClient, page: int):
-    response = user_client.get_users(page=page)
+def test_users_empty_data_on_page(user_client: UserApiClient, namespace_filter: dict, page: int):
+    response = user_client.get_users(page=page, **namespace_filter)
     assert response.status_code == HTTPStatus.OK
 
     body = response.json()
@@ -109,8 +109,8 @@ def test_users_invalid_page(user_client: UserApiClient, page: int | str):
 
 @pytest.mark.usefixtures("fill_test_data")
 @pytest.mark.parametrize("page, size", [(200, 100), (1500, 20)])
-def test_users_size_greater_than_total_count(user_client: UserApiClient, page: int, size: int):
-    response = user_client.get_users(page=page, size=size)
+def test_users_size_greater_than_total_count(user_client: UserApiClient, namespace_filter: dict, page: int, size: int):
+    response = user_client.get_users(page=page, size=size, **namespace_filter)
     assert response.status_code == HTTPStatus.OK
 
     body = response.json()
@@ -121,4 +121,30 @@ def test_users_size_greater_than_total_count(user_client: UserApiClient, page: i
 @pytest.mark.parametrize("size", [-1, 0, 101, 1000])
 def test_users_page_with_invalid_size(user_client: UserApiClient, size: int | str):
     response = user_client.get_users(size=size)
-    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY, f"Expected status code 422, but got {response.status_code}"
\ No newline at end of file
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY, f"Expected status code 422, but got {response.status_code}"
+
+@pytest.mark.usefixtures("fill_test_data")
+@pytest.mark.parametrize("size", [7, 50])
+def test_users_pages_cover_all_users_in_id_order(user_client: UserApiClient, namespace_filter: dict, all_users: list, size: int):
+    first_page = user_client.get_users(page=1, size=size, **namespace_filter).json()
+    ids = [user["id"] for user in first_page["items"]]
+    for page in range(2, first_page["pages"] + 1):
+        response = user_client.get_users(page=page, size=size, **namespace_filter)
+        assert response.status_code == HTTPStatus.OK
+        ids.extend(user["id"] for user in response.json()["items"])
+
+    assert ids == sorted(ids), "Expected users ordered by id across pages"
+    assert ids == sorted(user["id"] for user in all_users), "Expected pages to cover all users exactly once"
+
+@pytest.mark.usefixtures("fill_test_data")
+@pytest.mark.parametrize("page, size", [(1, 10), (2, 25)])
+def test_users_page_etag_not_modified(user_client: UserApiClient, namespace_filter: dict, page: int, size: int):
+    response = user_client.get_users(page=page, size=size, **namespace_filter)
+    etag = response.headers.get("ETag")
+    assert etag, "Expected ETag header in response"
+
+    not_modified = user_client.get_users_if_none_match(etag, page=page, size=size, **namespace_filter)
+    assert not_modified.status_code == HTTPStatus.NOT_MODIFIED, f"ERROR {not_modified.status_code} {not_modified.text}"
+
+    other_page = user_client.get_users_if_none_match(etag, page=page + 1, size=size, **namespace_filter)
+    assert other_page.status_code == HTTPStatus.OK, f"ERROR {other_page.status_code} {other_page.text}"
\ No newline at end of file
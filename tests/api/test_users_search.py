@@ -0,0 +1,60 @@
+import pytest
+from typing import Callable
+from http import HTTPStatus
+
+from app.models.User import User
+from clients.user_client import UserApiClient
+
+@pytest.mark.usefixtures("fill_test_data")
+@pytest.mark.parametrize("q", ["bluth", "BLUTH", "0@reqres.in", "aver", "Jan"])
+def test_users_search_matches_fragment(user_client: UserApiClient, all_users: list, in_namespace: Callable, q: str):
+    expected_ids = {
+        user["id"] for user in all_users
+        if any(q.lower() in user[field].lower() for field in ("email", "first_name", "last_name"))
+    }
+
+    found, page, pages = [], 1, 1
+    while page <= pages:
+        response = user_client.search_users(q=q, page=page, size=100)
+        assert response.status_code == HTTPStatus.OK, f"ERROR {response.status_code} {response.text}"
+        body = response.json()
+        for user in body["items"]:
+            User.model_validate(user)
+        found.extend(body["items"])
+        page, pages = page + 1, body["pages"]
+
+    assert expected_ids, f"Expected test data matching {q}"
+    assert body["total"] >= len(expected_ids), f"Expected total at least {len(expected_ids)}, but got {body['total']}"
+    assert {user["id"] for user in in_namespace(found)} == expected_ids
+
+@pytest.mark.usefixtures("fill_test_data")
+@pytest.mark.parametrize("field, q", [("email", "george.bluth@reqres.in"), ("last_name", "Weaver")])
+def test_users_search_ranks_exact_match_first(user_client: UserApiClient, data_namespace: str, field: str, q: str):
+    if field == "email":
+        q = f"{data_namespace}{q}"
+    response = user_client.search_users(q=q)
+    assert response.status_code == HTTPStatus.OK, f"ERROR {response.status_code} {response.text}"
+    first = response.json()["items"][0]
+
+    assert first[field].lower() == q.lower(), f"Expected exact match for {q} first, but got {first}"
+
+@pytest.mark.usefixtures("fill_test_data")
+@pytest.mark.parametrize("page, size", [(1, 5), (2, 5)])
+def test_users_search_pagination(user_client: UserApiClient, page: int, size: int):
+    response = user_client.search_users(q="reqres", page=page, size=size)
+    assert response.status_code == HTTPStatus.OK, f"ERROR {response.status_code} {response.text}"
+    body = response.json()
+
+    assert body["page"] == page, f"Expected page {page}, but got {body['page']}"
+    assert len(body["items"]) == size, f"Expected user count {size}, but got {len(body['items'])}"
+
+@pytest.mark.usefixtures("fill_test_data")
+def test_users_search_escapes_wildcards(user_client: UserApiClient):
+    response = user_client.search_users(q="%_%")
+    assert response.status_code == HTTPStatus.OK, f"ERROR {response.status_code} {response.text}"
+    assert response.json()["total"] == 0, "Expected wildcards to be matched literally"
+
+@pytest.mark.parametrize("q", ["", "ab"])
+def test_users_search_query_too_short(user_client: UserApiClient, q: str):
+    response = user_client.search_users(q=q)
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY, f"ERROR {response.status_code} {response.text}"
\ No newline at end of file
@@ -24,11 +24,24 @@ def app_url() -> str | None:
 
 def pytest_addoption(parser) -> None:
     parser.addoption("--env", default="dev")
+    parser.addoption("--async-engine", action="store_true", help="With --env inproc, serve requests through the async engine")
 
 @pytest.fixture(scope="session")
 def env(request) -> str:
     return request.config.getoption("--env")
 
+@pytest.fixture(scope="session", autouse=True)
+def in_process_app(request, env: str) -> Generator[None, None, None]:
+    # --env inproc serves app.main:app from this process: the lifespan runs once here, around the whole session
+    if env != "inproc":
+        yield
+        return
+    from app.utils.asgi_transport import in_process_app
+
+    in_process_app.start(async_engine=request.config.getoption("--async-engine"))
+    yield
+    in_process_app.stop()
+
 @pytest.fixture(scope="session")
 def user_client(env: str) -> UserApiClient:
     return UserApiClient(env)
@@ -37,24 +50,59 @@ def user_client(env: str) -> UserApiClient:
 def status_client(env: str) -> StatusApiClient:
     return StatusApiClient(env)
 
-@pytest.fixture(scope="module")
-def fill_test_data(user_client: UserApiClient) -> Generator[list[int], None, None]:
+@pytest.fixture
+def scrape_metrics(status_client: StatusApiClient) -> Callable[[], dict[str, float]]:
+    # Samples from /metrics keyed by name with labels, e.g. 'db_pool_size{engine="engine"}'
+    def _scrape() -> dict[str, float]:
+        response = status_client.get_metrics()
+        assert response.status_code == HTTPStatus.OK, f"ERROR {response.status_code} {response.text}"
+        samples = {}
+        for line in response.text.splitlines():
+            if line and not line.startswith("#"):
+                name, value = line.rsplit(" ", 1)
+                samples[name] = float(value)
+        return samples
+    return _scrape
+
+@pytest.fixture(scope="session")
+def data_namespace() -> str:
+    # Each pytest-xdist worker seeds its own copy of users.json under an email prefix, so workers
+    # never collide on unique emails and can scope their assertions to their own data
+    worker = os.getenv("PYTEST_XDIST_WORKER")
+    if worker is None:
+        return ""
+    return f"{worker}-{os.getenv('PYTEST_XDIST_TESTRUNUID', '')[:8]}."
+
+@pytest.fixture(scope="session")
+def namespace_filter(data_namespace: str) -> dict:
+    return {"email_prefix": data_namespace} if data_namespace else {}
+
+@pytest.fixture(scope="session")
+def in_namespace(data_namespace: str) -> Callable[[list[dict]], list[dict]]:
+    def _filter(users: list[dict]) -> list[dict]:
+        return [user for user in users if user["email"].startswith(data_namespace)]
+    return _filter
+
+@pytest.fixture(scope="session")
+def test_data_users(data_namespace: str) -> list[dict]:
     file_path = os.path.join(os.path.dirname(__file__), '..', 'users.json')
     with open(file_path, 'r') as f:
         test_data_user = json.load(f)
-    # with open("../users.json") as f:
-    #     test_data_user = json.load(f)
-    api_users = []
-    for user in test_data_user:
-        response = user_client.create_user_validated(user=UserCreate(**user))
-        api_users.append(response.json())
+    return [{**user, "email": f"{data_namespace}{user['email']}"} for user in test_data_user]
 
-    user_ids = [user["id"] for user in api_users]
+@pytest.fixture(scope="session")
+def fill_test_data(user_client: UserApiClient, test_data_users: list[dict]) -> Generator[list[int], None, None]:
+    # Seeded once per session (per worker under xdist) in a single bulk request, and removed the same way
+    response = user_client.create_users_bulk([UserCreate(**user) for user in test_data_users])
+    assert response.status_code == HTTPStatus.CREATED, f"ERROR {response.status_code} {response.text}"
+    body = response.json()
+    assert not body["errors"], f"Failed to seed test data: {body['errors']}"
+
+    user_ids = [user["id"] for user in body["created"]]
 
     yield user_ids
 
-    for user_id in user_ids:
-        user_client.delete_user(user_id)
+    user_client.delete_users_bulk(user_ids)
 
 @pytest.fixture
 def user_payload_factory() -> Callable[[], dict]:
@@ -80,14 +128,14 @@ def created_user_cleanup(user_client: UserApiClient) -> Generator[list[int], Non
 
     yield created_user_ids
 
-    for user_id in created_user_ids:
-        user_client.delete_user(user_id)
+    if created_user_ids:
+        user_client.delete_users_bulk(created_user_ids)
 
 @pytest.fixture
-def all_users(user_client: UserApiClient) -> list:
+def all_users(user_client: UserApiClient, in_namespace: Callable[[list[dict]], list[dict]]) -> list:
     response = user_client.get_all_users()
     assert response.status_code == HTTPStatus.OK
-    return response.json()
+    return in_namespace(response.json())
 
 @pytest.fixture
 def all_users_count(all_users: list) -> int: